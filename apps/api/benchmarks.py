@@ -0,0 +1,371 @@
+"""
+Offline benchmarks for the API and dispatch hot paths, against a throwaway SQLite database and a stub Vapi client.
+
+    python benchmarks.py --output bench.json
+    python benchmarks.py --rows 10000 --baseline bench.json    # exit 1 on a regression
+
+Results are flat metric -> {value, unit, better} JSON tagged with the git commit, so runs per
+commit can be diffed. Scale through BENCH_* env vars or the matching flags.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+# Add the apps/api directory to sys.path to import src
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+BENCH_ROWS = os.getenv("BENCH_ROWS", "10000,100000,1000000")
+BENCH_CREATE_REQUESTS = int(os.getenv("BENCH_CREATE_REQUESTS", "2000"))
+BENCH_LIST_REQUESTS = int(os.getenv("BENCH_LIST_REQUESTS", "50"))
+BENCH_AUTH_REQUESTS = int(os.getenv("BENCH_AUTH_REQUESTS", "2000"))
+BENCH_WEBHOOKS = int(os.getenv("BENCH_WEBHOOKS", "5000"))
+BENCH_DUE_REMINDERS = int(os.getenv("BENCH_DUE_REMINDERS", "1000"))
+BENCH_RENDERS = int(os.getenv("BENCH_RENDERS", "100000"))
+# Simulated Vapi round trip for the stub client
+BENCH_VAPI_LATENCY_MS = int(os.getenv("BENCH_VAPI_LATENCY_MS", "0"))
+INSERT_CHUNK = 10000
+PHONE = "+14155552671"
+
+def configure(tmp_dir: str):
+    # Must run before src is imported: fresh database, dispatcher mode, no scheduler in the API process
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'database.db')}"
+    os.environ["SCHEDULER_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'scheduler_jobs.db')}"
+    os.environ["SCHEDULER_MODE"] = "dispatcher"
+    os.environ["API_RUNS_SCHEDULER"] = "false"
+    os.environ.setdefault("CALL_RATE_PER_SECOND", "100000")
+    os.environ.setdefault("CALL_CONCURRENCY", "16")
+    os.environ.setdefault("CALL_QUEUE_SIZE", str(max(1000, BENCH_DUE_REMINDERS)))
+    # Measures the request path itself, so rate limits and the pending quota stay out of the way
+    for name in ("RATE_LIMIT_SIGNIN_PER_IP", "RATE_LIMIT_SIGNIN_PER_PHONE", "RATE_LIMIT_USER_WRITES", "MAX_PENDING_REMINDERS_PER_USER"):
+        os.environ.setdefault(name, "0")
+
+def metric(value: float, unit: str, better: str) -> dict:
+    return {"value": round(value, 3), "unit": unit, "better": better}
+
+def latency_metrics(name: str, samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        f"{name}.p50_ms": metric(statistics.median(samples) * 1000, "ms", "lower"),
+        f"{name}.p95_ms": metric(samples[min(len(samples) - 1, int(0.95 * len(samples)))] * 1000, "ms", "lower"),
+    }
+
+def timed(fn, requests: int) -> list:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def check(response):
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code}: {response.text[:200]}")
+    return response
+
+def insert_reminders(user_id: int, count: int, start: int = 0, **values):
+    """
+    Bulk-inserts `count` reminders straight through the engine, bypassing the API.
+    """
+    from sqlalchemy import insert
+    from src.database import engine
+    from src.models import Reminder, utcnow
+
+    now = utcnow()
+    words = ["call", "mom", "dentist", "invoice", "standup", "pharmacy", "gym", "renew", "passport", "taxes"]
+    for chunk_start in range(start, start + count, INSERT_CHUNK):
+        chunk_end = min(start + count, chunk_start + INSERT_CHUNK)
+        with engine.begin() as conn:
+            conn.execute(insert(Reminder), [
+                {
+                    "title": f"{words[i % len(words)]} reminder {i}",
+                    "description": f"{words[(i * 7) % len(words)]} {words[(i * 3) % len(words)]}",
+                    "scheduled_time": now + timedelta(days=1, seconds=i),
+                    "status": "pending",
+                    "phone_to_call": PHONE,
+                    "user_id": user_id,
+                    "created_at": now - timedelta(seconds=i),
+                    **values,
+                }
+                for i in range(chunk_start, chunk_end)
+            ])
+
+def bench_create(client) -> dict:
+    scheduled_time = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    body = {"title": "Benchmark", "description": "POST /reminders", "scheduled_time": scheduled_time, "phone_to_call": PHONE}
+    started = time.perf_counter()
+    samples = timed(lambda: check(client.post("/reminders", json=body)), BENCH_CREATE_REQUESTS)
+    elapsed = time.perf_counter() - started
+    return {
+        "create_reminder.throughput_rps": metric(BENCH_CREATE_REQUESTS / elapsed, "req/s", "higher"),
+        **latency_metrics("create_reminder", samples),
+    }
+
+def bench_list(client, user_id: int, row_counts: list) -> dict:
+    """
+    GET /reminders (and /reminders/stats) latency as the user's table grows, each size reached by topping up the previous one.
+    """
+    from sqlmodel import select, func
+    from src.database import SessionLocal
+    from src.models import Reminder
+
+    with SessionLocal() as session:
+        existing = session.exec(select(func.count()).select_from(Reminder).where(Reminder.user_id == user_id)).one()
+    results = {}
+    queries = {
+        "offset": {},
+        "cursor": {"cursor": "", "total": "none"},
+        "cursor_500": {"cursor": "", "total": "none", "limit": 500},
+        "search_like": {"search": "dentist", "search_mode": "like"},
+        "search_fts": {"search": "dentist", "search_mode": "fts"},
+    }
+    for rows in row_counts:
+        if rows > existing:
+            started = time.perf_counter()
+            insert_reminders(user_id, rows - existing, start=existing)
+            print(f"[BENCH] Inserted {rows - existing} reminders in {time.perf_counter() - started:.1f}s")
+            existing = rows
+        for name, params in queries.items():
+            samples = timed(lambda: check(client.get("/reminders", params={"limit": 50, **params})), BENCH_LIST_REQUESTS)
+            results.update(latency_metrics(f"list_reminders.{name}.{rows}", samples))
+        samples = timed(lambda: check(client.get("/reminders/stats")), BENCH_LIST_REQUESTS)
+        results.update(latency_metrics(f"reminder_stats.{rows}", samples))
+    # Bytes on the wire for a large page, as sent to clients with and without gzip
+    for name, encoding in (("gzip", "gzip"), ("identity", "identity")):
+        response = check(client.get("/reminders", params={"limit": 500, "cursor": "", "total": "none"}, headers={"Accept-Encoding": encoding}))
+        results[f"list_reminders.page_500.{name}_bytes"] = metric(int(response.headers["content-length"]), "bytes", "lower")
+    return results
+
+def bench_auth(client, token: str) -> dict:
+    """
+    get_current_user overhead: GET /me against the unauthenticated root, with a warm and a cold session cache.
+    """
+    from src.services.session_cache import invalidate_session
+
+    baseline = timed(lambda: check(client.get("/")), BENCH_AUTH_REQUESTS)
+    cached = timed(lambda: check(client.get("/me")), BENCH_AUTH_REQUESTS)
+
+    def uncached():
+        invalidate_session(token)
+        check(client.get("/me"))
+
+    cold = timed(uncached, BENCH_AUTH_REQUESTS)
+    base = statistics.median(baseline)
+    return {
+        "auth.baseline.p50_ms": metric(base * 1000, "ms", "lower"),
+        "auth.cached_overhead.p50_ms": metric((statistics.median(cached) - base) * 1000, "ms", "lower"),
+        "auth.uncached_overhead.p50_ms": metric((statistics.median(cold) - base) * 1000, "ms", "lower"),
+    }
+
+def wait_until(condition, timeout: float = 120.0, interval: float = 0.05):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Benchmark condition not met in time")
+        time.sleep(interval)
+
+def bench_webhooks(client, user_id: int) -> dict:
+    """
+    End-of-call reports for reminders in calling: acknowledgement rate and rate at which they are applied.
+    """
+    from sqlalchemy import insert
+    from sqlmodel import select, func
+    from src.database import SessionLocal, engine
+    from src.models import Reminder
+
+    run = uuid.uuid4().hex[:8]
+    call_ids = [f"bench-{run}-{i}" for i in range(BENCH_WEBHOOKS)]
+    with engine.begin() as conn:
+        conn.execute(insert(Reminder), [
+            {"title": f"webhook {i}", "description": "", "status": "calling", "phone_to_call": PHONE,
+             "user_id": user_id, "vapi_call_id": call_id, "created_at": datetime.now()}
+            for i, call_id in enumerate(call_ids)
+        ])
+
+    def remaining() -> int:
+        with SessionLocal() as session:
+            return session.exec(
+                select(func.count()).select_from(Reminder).where(Reminder.vapi_call_id.like(f"bench-{run}-%"), Reminder.status == "calling")
+            ).one()
+
+    started = time.perf_counter()
+    for call_id in call_ids:
+        check(client.post("/webhook/vapi", json={"message": {
+            "type": "end-of-call-report", "call": {"id": call_id}, "endedReason": "customer-ended-call", "durationSeconds": 30,
+        }}))
+    acked = time.perf_counter() - started
+    wait_until(lambda: remaining() == 0)
+    applied = time.perf_counter() - started
+    return {
+        "webhook.ack_rate_rps": metric(BENCH_WEBHOOKS / acked, "req/s", "higher"),
+        "webhook.applied_rate_eps": metric(BENCH_WEBHOOKS / applied, "events/s", "higher"),
+    }
+
+def bench_dispatch(user_id: int) -> dict:
+    """
+    N reminders due in the same second: lag from their scheduled time to each (stub) call starting.
+    """
+    from sqlalchemy import insert
+    from sqlmodel import select, func
+    from src.database import SessionLocal, engine
+    from src.models import CallAttempt, Reminder, utcnow
+    from src.services import scheduling
+    from src.services.dispatcher import dispatch_due_reminders
+
+    def stub_call(phone_number: str, title: str, description: str, template=None):
+        if BENCH_VAPI_LATENCY_MS:
+            time.sleep(BENCH_VAPI_LATENCY_MS / 1000)
+        return SimpleNamespace(id=f"stub-{uuid.uuid4()}")
+
+    scheduling.make_reminder_call = stub_call
+    due_at = (utcnow() + timedelta(seconds=2)).replace(microsecond=0)
+    run = uuid.uuid4().hex[:8]
+    with engine.begin() as conn:
+        conn.execute(insert(Reminder), [
+            {"title": f"dispatch-{run} {i}", "description": "", "scheduled_time": due_at, "status": "pending",
+             "phone_to_call": PHONE, "user_id": user_id, "created_at": datetime.now()}
+            for i in range(BENCH_DUE_REMINDERS)
+        ])
+    with SessionLocal() as session:
+        ids = session.exec(select(Reminder.id).where(Reminder.title.like(f"dispatch-{run} %"))).all()
+
+    def attempts() -> int:
+        with SessionLocal() as session:
+            return session.exec(select(func.count()).select_from(CallAttempt).where(CallAttempt.reminder_id.in_(ids))).one()
+
+    scheduling.call_executor.start()
+    try:
+        wait_until(lambda: utcnow() >= due_at, interval=0.01)
+        started = time.perf_counter()
+        dispatch_due_reminders(scheduling.submit_reminder_call)
+        wait_until(lambda: attempts() == len(ids))
+        drained = time.perf_counter() - started
+    finally:
+        scheduling.call_executor.shutdown()
+
+    with SessionLocal() as session:
+        lags = session.exec(select(CallAttempt.dispatch_lag_seconds).where(CallAttempt.reminder_id.in_(ids))).all()
+    lags = sorted(lags)
+    return {
+        "dispatch.lag.p50_s": metric(statistics.median(lags), "s", "lower"),
+        "dispatch.lag.p95_s": metric(lags[min(len(lags) - 1, int(0.95 * len(lags)))], "s", "lower"),
+        "dispatch.lag.max_s": metric(lags[-1], "s", "lower"),
+        "dispatch.drain_rate_cps": metric(len(ids) / drained, "calls/s", "higher"),
+    }
+
+def bench_render() -> dict:
+    """
+    Per-call CPU and body size of the Vapi call payload, built-in script and a template with language and voice.
+    """
+    from src.services.call_templates import compile_template
+    from src.services.vapi import build_assistant_overrides
+
+    templates = {
+        "default": compile_template(),
+        "localized": compile_template("Olá! Este é um lembrete: {title}. Detalhes: {description}", "pt", "11labs", "voice-id"),
+    }
+    results = {}
+    for name, template in templates.items():
+        started = time.perf_counter()
+        for i in range(BENCH_RENDERS):
+            body = json.dumps({
+                "phoneNumberId": "phone-number-id",
+                "customer": {"number": PHONE},
+                "assistantId": "assistant-id",
+                "assistantOverrides": build_assistant_overrides(f"Dentist {i}", "Bring the insurance card", template),
+            }, separators=(",", ":"))
+        elapsed = time.perf_counter() - started
+        results[f"call_payload.{name}.render_us"] = metric(elapsed / BENCH_RENDERS * 1e6, "us", "lower")
+        results[f"call_payload.{name}.bytes"] = metric(len(body), "bytes", "lower")
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def run(row_counts: list) -> dict:
+    from fastapi.testclient import TestClient
+    from main import app
+
+    results = {}
+    with TestClient(app) as client:
+        signin = check(client.post("/signin", json={"phone_number": PHONE})).json()
+        token = signin["session_token"]
+        client.cookies.set("session_token", token)
+        user_id = check(client.get("/me")).json()["id"]
+
+        sections = [
+            ("create", lambda: bench_create(client)),
+            ("auth", lambda: bench_auth(client, token)),
+            ("webhooks", lambda: bench_webhooks(client, user_id)),
+            ("dispatch", lambda: bench_dispatch(user_id)),
+            ("render", bench_render),
+            # Last, since it grows the table to the largest size
+            ("list", lambda: bench_list(client, user_id, row_counts)),
+        ]
+        for name, section in sections:
+            started = time.perf_counter()
+            results.update(section())
+            print(f"[BENCH] {name} done in {time.perf_counter() - started:.1f}s")
+    return results
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Metrics that got worse than the baseline by more than `tolerance` (relative).
+    """
+    found = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous["value"]:
+            continue
+        change = (current["value"] - previous["value"]) / abs(previous["value"])
+        if (change if current["better"] == "lower" else -change) > tolerance:
+            found.append(f"{name}: {previous['value']} -> {current['value']} {current['unit']} ({change:+.0%})")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default=BENCH_ROWS, help="Comma-separated table sizes for GET /reminders")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configure(tmp_dir)
+        results = run(sorted(int(rows) for rows in args.rows.split(",")))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"[BENCH] Regression {line}")
+        if found:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,85 +1,68 @@
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
 
 load_dotenv(".env.local")
 load_dotenv()
 import uuid
-from datetime import datetime, timedelta
-from fastapi import FastAPI, Depends, HTTPException, Request
+import json
+import asyncio
+import hmac
+import math
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session, select, or_, func
-from src.database import create_db_and_tables, get_session, scheduler_engine, SessionLocal
-from src.models import User, Reminder, Session as DbSession
-from src.services.vapi import make_reminder_call
-from pydantic import BaseModel, field_validator, Field as PydanticField
-import phonenumbers
-
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-
-# Dependency injection for scheduler if needed later
-scheduler = BackgroundScheduler(
-    jobstores={'default': SQLAlchemyJobStore(engine=scheduler_engine)}
-)
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlmodel import Session, select, delete, update, or_, and_, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.database import create_db_and_tables, get_session, get_async_session, AsyncSessionLocal, engine, async_engine, scheduler_engine, SessionLocal
+from src.models import User, Reminder, ReminderArchive, CallAttempt, CallTemplate, ReminderEvent, Session as DbSession, utcnow, to_naive_utc
+from src.services.session_cache import cache_session, get_cached_session, invalidate_session
+from src.services.pagination import encode_cursor, decode_cursor, total_count_cache
+from src.services.listing import ReminderPage, ReminderListItem, ArchivedReminderPage, LIST_MAX_LIMIT, parse_fields, list_columns, build_items, cursor_key, page_response
+from src.services.webhook_queue import WebhookIngestor
+from src.services.history import record_event, call_stats
+from src.services.status_events import status_broker, publish_status, STATUS_STREAM_KEEPALIVE_SECONDS
+from src.services.metrics import instrument_engine, metrics_middleware, metrics_response, current_trace_parent
+from src.services.stats import setup_stats, reminder_stats, pending_count
+from src.services.rate_limit import RateLimitExceeded, check_rate_limit, check_pending_quota, remaining_pending_quota, client_ip
+from src.services.search import setup_search, search_backend, has_search_terms, DEFAULT_SEARCH_MODE
+# execute_reminder_call stays importable from main: jobs stored before it moved reference main:execute_reminder_call
+from src.services.scheduling import scheduler, call_executor, start_scheduling, stop_scheduling, execute_reminder_call, schedule_reminders, unschedule_reminders
+from src.services.phone import normalize_e164, validate_phone_numbers
+from src.services.call_templates import validate_first_message, owned_template_ids
+from src.services.recurrence import start_series, advance_series, validate_recurrence, validate_timezone
+from pydantic import BaseModel, ValidationError, field_validator, model_validator, Field as PydanticField
+
+# The API can run the scheduler itself (single process) or only enqueue, leaving calls to `python -m src.worker`
+API_RUNS_SCHEDULER = os.getenv("API_RUNS_SCHEDULER", "true").lower() == "true"
+# Bearer token for the ops endpoints (stats across all users); they are disabled while it's unset
+OPS_API_TOKEN = os.getenv("OPS_API_TOKEN")
+
+instrument_engine(engine, "app")
+instrument_engine(async_engine.sync_engine, "app_async")
+instrument_engine(scheduler_engine, "scheduler")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
-    scheduler.start()
-    print("Scheduler started")
+    setup_search(engine)
+    setup_stats(engine)
+    webhook_ingestor.start()
+    start_scheduling(run_calls=API_RUNS_SCHEDULER)
     yield
-    scheduler.shutdown()
-    print("Scheduler shut down")
+    stop_scheduling()
+    webhook_ingestor.shutdown()
 
 app = FastAPI(lifespan=lifespan)
 
-def execute_reminder_call(reminder_id: int):
-    """
-    Job function called by APScheduler.
-    """
-    print(f"[SCHEDULER] Job started for reminder_id: {reminder_id}")
-    with SessionLocal() as session:
-        reminder = session.exec(select(Reminder).where(Reminder.id == reminder_id)).first()
-        if not reminder:
-            print(f"Reminder {reminder_id} not found")
-            return
-
-        user = session.get(User, reminder.user_id)
-        if not user:
-            print(f"User for reminder {reminder_id} not found")
-            return
-
-        print(f"Executing call for reminder {reminder.id} to {reminder.phone_to_call}")
-        
-        try:
-            call = make_reminder_call(
-                phone_number=reminder.phone_to_call,
-                title=reminder.title,
-                description=reminder.description or ""
-            )
-            
-            if call and hasattr(call, 'id'):
-                reminder.vapi_call_id = call.id
-                reminder.status = "calling"
-                print(f"Call initiated for reminder {reminder.id}, call_id: {call.id}")
-            else:
-                reminder.status = "failed"
-                print(f"Failed to initiate call for reminder {reminder.id}")
-
-            session.add(reminder)
-            session.commit()
-        except Exception as e:
-            print(f"Error triggered for reminder {reminder.id}: {e}")
-            reminder.status = "failed"
-            session.add(reminder)
-            session.commit()
-
 # Get CORS origins from environment variable, default to localhost if not set
 cors_origins_str = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000")
 origins = [origin.strip() for origin in cors_origins_str.split(",")]
 
+app.middleware("http")(metrics_middleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -88,30 +71,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
 class SigninRequest(BaseModel):
     phone_number: str
 
     @field_validator("phone_number")
     @classmethod
     def validate_e164(cls, v: str) -> str:
-        try:
-            # Parse the phone number
-            parsed_number = phonenumbers.parse(v)
-            # Check if it's a valid number and in E.164 format
-            if not (phonenumbers.is_valid_number(parsed_number) and v.startswith('+')):
-                raise ValueError("Invalid phone number format")
-            
-            # Format to E.164 to be sure
-            return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
-        except Exception:
-            raise ValueError("Phone number must be a valid E.164 formatted number (e.g. +1234567890)")
+        return normalize_e164(v)
 
 @app.get("/")
 def read_root():
     return {"Hello": "World", "Service": "API"}
 
-@app.post("/signin")
+@app.get("/metrics")
+def metrics():
+    return metrics_response()
+
+def require_ops_token(request: Request):
+    """
+    Guards the cross-user ops endpoints: disabled (404) unless OPS_API_TOKEN is set, then the
+    caller must send it as a bearer token.
+    """
+    if not OPS_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), OPS_API_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid ops token")
+
+@app.get("/dispatch/stats", dependencies=[Depends(require_ops_token)])
+def dispatch_stats():
+    return call_executor.stats()
+
+def limit_signin_ip(request: Request):
+    check_rate_limit("signin_ip", client_ip(request))
+
+@app.post("/signin", dependencies=[Depends(limit_signin_ip)])
 def signin(request: SigninRequest, session: Session = Depends(get_session)):
+    # Every signin inserts a session row, so repeat signins for one number are capped too
+    check_rate_limit("signin_phone", request.phone_number)
+    check_rate_limit("global_writes")
     user = session.exec(select(User).where(User.phone_number == request.phone_number)).first()
     if not user:
         user = User(phone_number=request.phone_number)
@@ -128,14 +134,24 @@ def signin(request: SigninRequest, session: Session = Depends(get_session)):
 
     return {"message": "Authenticated", "user": user, "session_token": token}
 
-def get_current_user(request: Request, session: Session = Depends(get_session)):
+async def get_current_user(request: Request, session: AsyncSession = Depends(get_async_session)):
     session_token = request.cookies.get("session_token")
     if not session_token:
         # print("DEBUG: Missing session_token cookie")
         raise HTTPException(status_code=401, detail="Not authenticated: Missing session_token")
 
+    # Repeat requests are served from the session cache without touching the database
+    cached = get_cached_session(session_token)
+    if cached:
+        return User(
+            id=cached["user_id"],
+            phone_number=cached["phone_number"],
+            timezone=cached.get("timezone"),
+            call_template_id=cached.get("call_template_id"),
+        )
+
     # Secure auth: look up session
-    db_session = session.exec(select(DbSession).where(DbSession.token == session_token)).first()
+    db_session = (await session.exec(select(DbSession).where(DbSession.token == session_token))).first()
     
     if not db_session:
         # print(f"DEBUG: Session not found for token: {session_token}")
@@ -145,21 +161,185 @@ def get_current_user(request: Request, session: Session = Depends(get_session)):
         # print("DEBUG: Session expired")
         raise HTTPException(status_code=401, detail="Session expired")
 
-    user = session.get(User, db_session.user_id)
+    user = await session.get(User, db_session.user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-        
+
+    cache_session(session_token, user.id, user.phone_number, db_session.expires_at, user.timezone, user.call_template_id)
     return user
 
+async def get_writing_user(user: User = Depends(get_current_user)):
+    """
+    get_current_user for endpoints that write, counted against the per-user and global write limits.
+    """
+    check_rate_limit("user_writes", str(user.id))
+    check_rate_limit("global_writes")
+    return user
+
+@app.post("/signout")
+def signout(request: Request, session: Session = Depends(get_session)):
+    session_token = request.cookies.get("session_token")
+    if session_token:
+        invalidate_session(session_token)
+        db_session = session.exec(select(DbSession).where(DbSession.token == session_token)).first()
+        if db_session:
+            session.delete(db_session)
+            session.commit()
+    return {"message": "Signed out"}
+
 @app.get("/me")
 def get_me(user: User = Depends(get_current_user)):
     return user
 
+class UpdateMeRequest(BaseModel):
+    # Omitted fields are left as they are
+    # IANA zone, e.g. "America/Sao_Paulo"; null clears it (UTC)
+    timezone: Optional[str] = None
+    # Default call template for reminders that don't pick one; null goes back to the built-in script
+    call_template_id: Optional[int] = None
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone_name(cls, v: Optional[str]) -> Optional[str]:
+        return validate_timezone(v)
+
+@app.patch("/me")
+def update_me(
+    request: Request,
+    update: UpdateMeRequest,
+    user: User = Depends(get_writing_user),
+    session: Session = Depends(get_session)
+):
+    db_user = session.get(User, user.id)
+    if "call_template_id" in update.model_fields_set:
+        if update.call_template_id is not None:
+            template = session.get(CallTemplate, update.call_template_id)
+            if not template or template.user_id != user.id:
+                raise HTTPException(status_code=400, detail="Call template not found")
+        db_user.call_template_id = update.call_template_id
+    if "timezone" in update.model_fields_set:
+        db_user.timezone = update.timezone
+    session.add(db_user)
+    session.commit()
+    session.refresh(db_user)
+    # Other sessions of the user pick the change up when their cache entry expires
+    invalidate_session(request.cookies.get("session_token"))
+    return db_user
+
+class CallTemplateRequest(BaseModel):
+    name: str
+    # str.format template over {title} and {description}, e.g. "Olá! Lembrete: {title}. {description}"
+    first_message: str
+    # Transcriber language code, e.g. "pt"
+    language: Optional[str] = None
+    voice_provider: Optional[str] = None
+    voice_id: Optional[str] = None
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, v: str) -> str:
+        if not v.strip():
+            raise ValueError("Name is required")
+        return v
+
+    @field_validator("first_message")
+    @classmethod
+    def validate_first_message_template(cls, v: str) -> str:
+        return validate_first_message(v)
+
+    @model_validator(mode="after")
+    def validate_voice(self):
+        if bool(self.voice_provider) != bool(self.voice_id):
+            raise ValueError("voice_provider and voice_id must be set together")
+        return self
+
+@app.get("/call-templates")
+async def list_call_templates(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    return (await session.exec(select(CallTemplate).where(CallTemplate.user_id == user.id).order_by(CallTemplate.id))).all()
+
+@app.post("/call-templates")
+async def create_call_template(
+    template_data: CallTemplateRequest,
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    template = CallTemplate(user_id=user.id, **template_data.model_dump())
+    session.add(template)
+    await session.commit()
+    await session.refresh(template)
+    return template
+
+@app.put("/call-templates/{template_id:int}")
+async def update_call_template(
+    template_id: int,
+    template_data: CallTemplateRequest,
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    template = await session.get(CallTemplate, template_id)
+    if not template or template.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Call template not found")
+    # Calls placed from now on compile the new content; the compile cache is keyed by it
+    for field, value in template_data.model_dump().items():
+        setattr(template, field, value)
+    session.add(template)
+    await session.commit()
+    await session.refresh(template)
+    return template
+
+@app.delete("/call-templates/{template_id:int}")
+async def delete_call_template(
+    request: Request,
+    template_id: int,
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    template = await session.get(CallTemplate, template_id)
+    if not template or template.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Call template not found")
+    # Detach it first, so a later template that reuses the id isn't picked up by old reminders
+    await session.execute(
+        update(Reminder).where(Reminder.user_id == user.id, Reminder.template_id == template_id).values(template_id=None)
+    )
+    await session.execute(
+        update(User).where(User.id == user.id, User.call_template_id == template_id).values(call_template_id=None)
+    )
+    await session.delete(template)
+    await session.commit()
+    if user.call_template_id == template_id:
+        invalidate_session(request.cookies.get("session_token"))
+    return {"message": "Call template deleted"}
+
 class CreateReminderRequest(BaseModel):
     title: str
     description: str
     scheduled_time: datetime
     phone_to_call: str
+    # RRULE body, e.g. "FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20270101T000000Z"; scheduled_time starts the series
+    recurrence: Optional[str] = None
+    # IANA zone for a naive scheduled_time and the recurrence's wall-clock time (defaults to the user's, then UTC)
+    timezone: Optional[str] = None
+    # One of the user's call templates (defaults to the user's default template, then the built-in script)
+    template_id: Optional[int] = None
+
+    @field_validator("phone_to_call")
+    @classmethod
+    def validate_phone_to_call(cls, v: str) -> str:
+        # Catches bad numbers here instead of as a failed Vapi call at the scheduled time
+        return normalize_e164(v)
+
+    @field_validator("recurrence")
+    @classmethod
+    def validate_recurrence_rule(cls, v: Optional[str]) -> Optional[str]:
+        return validate_recurrence(v)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone_name(cls, v: Optional[str]) -> Optional[str]:
+        return validate_timezone(v)
 
     @field_validator("title")
     @classmethod
@@ -178,20 +358,16 @@ class CreateReminderRequest(BaseModel):
     @field_validator("scheduled_time")
     @classmethod
     def validate_future_date(cls, v: datetime) -> datetime:
-        if v.tzinfo:
-            now = datetime.now(v.tzinfo)
-        else:
-            now = datetime.now()
-        
-        if v <= now:
+        # Naive times are checked by start_series, once their timezone is known
+        if v.tzinfo and to_naive_utc(v) <= utcnow():
             raise ValueError("Scheduled time must be in the future")
         return v
 
-@app.post("/reminders")
+@app.post("/reminders", response_model=ReminderListItem)
 async def create_reminder(
     reminder_data: CreateReminderRequest, 
-    user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
 ):
     reminder = Reminder(
         title=reminder_data.title,
@@ -199,38 +375,60 @@ async def create_reminder(
         scheduled_time=reminder_data.scheduled_time,
         status="pending",
         phone_to_call=reminder_data.phone_to_call,
-        user_id=user.id
+        user_id=user.id,
+        trace_parent=current_trace_parent(),
+        template_id=reminder_data.template_id
     )
+    check_pending_quota(await pending_count(session, user.id))
+    if reminder_data.template_id is not None and not await owned_template_ids(session, user.id, [reminder_data.template_id]):
+        raise HTTPException(status_code=400, detail="Call template not found")
+    try:
+        start_series(reminder, reminder_data.recurrence, reminder_data.timezone or user.timezone, reminder_data.scheduled_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     session.add(reminder)
-    session.commit()
-    session.refresh(reminder)
-
-    # Schedule the job
-    scheduler.add_job(
-        execute_reminder_call,
-        "date",
-        run_date=reminder_data.scheduled_time,
-        args=[reminder.id],
-        id=f"reminder_{reminder.id}"
-    )
-    print(f"Scheduled job for reminder {reminder.id} at {reminder.scheduled_time}")
+    await session.commit()
+    await session.refresh(reminder)
+    total_count_cache.invalidate(user.id)
+
+    # Job store writes block, so they run off the event loop (a no-op in dispatcher mode)
+    await asyncio.to_thread(schedule_reminders, [reminder])
 
     return reminder
 
-@app.get("/reminders")
+@app.get("/reminders", response_model=ReminderPage)
 async def list_reminders(
-    page: int = 1,
-    limit: int = 50,
+    request: Request,
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=LIST_MAX_LIMIT),
     search: Optional[str] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    total: str = "exact",
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    fields: Optional[str] = None,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
-    offset = (page - 1) * limit
-    
+    """
+    Offset pagination by `page`, or keyset pagination when `cursor` is passed
+    (empty for the first page, then each response's `next_cursor`).
+    `total` is "exact", "cached" (reused for a few seconds) or "none" (skips the count).
+    `search_mode` "fts" prefix-matches words through the full-text index, ranking offset pages
+    by relevance; "like" is the plain substring match.
+    `fields` narrows each item to the listed columns, e.g. "id,title,status".
+    """
+    try:
+        item_fields = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     filters = [Reminder.user_id == user.id]
-    
-    if search:
+    match = None
+
+    if search and search_mode == "fts" and search_backend() and has_search_terms(search):
+        match = search_backend().match(search)
+    elif search:
         filters.append(or_(Reminder.title.contains(search), Reminder.description.contains(search)))
         
     if status and status.lower() != "all":
@@ -240,24 +438,166 @@ async def list_reminders(
         filters.append(Reminder.status == s)
 
     # Get Total Count
-    total = session.exec(select(func.count()).where(*filters)).one()
-    
+    count = None
+    if total != "none":
+        cache_key = (search, search_mode if match is not None else None, status)
+        if total == "cached":
+            count = total_count_cache.get(user.id, cache_key)
+        if count is None:
+            count_query = select(func.count()).select_from(Reminder)
+            if match is not None:
+                count_query = count_query.join(match, match.c.reminder_id == Reminder.id)
+            count = (await session.exec(count_query.where(*filters))).one()
+            total_count_cache.set(user.id, cache_key, count)
+
+    # Plain column tuples turned into dicts: no ORM hydration and no per-row pydantic validation
+    query = select(*list_columns(item_fields)).where(*filters)
+    if match is not None:
+        query = query.join(match, match.c.reminder_id == Reminder.id)
+        if cursor is None:
+            query = query.order_by(match.c.rank)
+    query = query.order_by(Reminder.created_at.desc(), Reminder.id.desc())
+
+    if cursor is not None:
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(or_(
+                Reminder.created_at < cursor_created_at,
+                and_(Reminder.created_at == cursor_created_at, Reminder.id < cursor_id)
+            ))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = (await session.exec(query.limit(limit + 1))).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(*cursor_key(rows[-1], item_fields))
+
+        return page_response(request, {
+            "items": build_items(rows, item_fields),
+            "total": count,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        })
+
+    offset = (page - 1) * limit
+
     # Get Items
-    items = session.exec(
-        select(Reminder)
-        .where(*filters)
-        .order_by(Reminder.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    ).all()
+    rows = (await session.exec(query.offset(offset).limit(limit))).all()
 
-    return {
-        "items": items,
-        "total": total,
+    return page_response(request, {
+        "items": build_items(rows, item_fields),
+        "total": count,
         "page": page,
         "limit": limit,
-        "total_pages": (total + limit - 1) // limit
-    }
+        "total_pages": (count + limit - 1) // limit if count is not None else None
+    })
+
+@app.get("/reminders/stream")
+async def stream_reminder_status(request: Request):
+    """
+    Server-sent events with the user's reminder status changes, so clients can stop polling.
+    """
+    # Authenticate with a short-lived session: a dependency session would stay open for the whole stream
+    async with AsyncSessionLocal() as session:
+        user = await get_current_user(request, session)
+    subscription = status_broker.subscribe(user.id)
+
+    async def events():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=STATUS_STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: status\ndata: {json.dumps(event)}\n\n"
+        finally:
+            status_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/reminders/stats")
+async def get_reminder_stats(
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Reminder counts per status and pending reminders due in the next 24 hours.
+    """
+    return await reminder_stats(session, user.id)
+
+@app.get("/reminders/archived", response_model=ArchivedReminderPage)
+async def list_archived_reminders(
+    limit: int = Query(50, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Finished reminders moved out by the retention job, newest first, with keyset pagination like GET /reminders.
+    """
+    query = (
+        select(ReminderArchive)
+        .where(ReminderArchive.user_id == user.id)
+        .order_by(ReminderArchive.created_at.desc(), ReminderArchive.id.desc())
+    )
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(or_(
+            ReminderArchive.created_at < cursor_created_at,
+            and_(ReminderArchive.created_at == cursor_created_at, ReminderArchive.id < cursor_id)
+        ))
+
+    items = (await session.exec(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+@app.get("/reminders/{reminder_id:int}/history")
+def reminder_history(
+    reminder_id: int,
+    user: User = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    events = session.exec(
+        select(ReminderEvent)
+        .where(ReminderEvent.reminder_id == reminder_id, ReminderEvent.user_id == user.id)
+        .order_by(ReminderEvent.created_at)
+    ).all()
+    attempts = session.exec(
+        select(CallAttempt)
+        .where(CallAttempt.reminder_id == reminder_id, CallAttempt.user_id == user.id)
+        .order_by(CallAttempt.started_at)
+    ).all()
+    return {"events": events, "attempts": attempts}
+
+@app.get("/ops/calls/stats", dependencies=[Depends(require_ops_token)])
+def ops_call_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    session: Session = Depends(get_session)
+):
+    """
+    Call attempt aggregates for the ops dashboard, defaulting to the last 24 hours (UTC).
+    """
+    until = to_naive_utc(until) if until else utcnow()
+    since = to_naive_utc(since) if since else until - timedelta(hours=24)
+    return call_stats(session, since, until)
 
 class VapiCall(BaseModel):
     id: str
@@ -267,61 +607,92 @@ class VapiWebhookMessage(BaseModel):
     call: VapiCall
     endedReason: Optional[str] = None
     transcript: Optional[str] = None
+    status: Optional[str] = None
+    timestamp: Optional[float] = None
+    durationSeconds: Optional[float] = None
+
+    def event_id(self) -> str:
+        # Vapi sends one end-of-call report per call, so its retries share an id regardless of timestamp
+        if self.type == "end-of-call-report":
+            return f"{self.type}:{self.call.id}"
+        return f"{self.type}:{self.call.id}:{self.status or ''}:{self.timestamp or ''}"
 
 class VapiWebhookRequest(BaseModel):
     message: VapiWebhookMessage
 
-@app.post("/webhook/vapi")
-async def vapi_webhook(
-    request: VapiWebhookRequest,
-    session: Session = Depends(get_session)
-):
-    print(f"Received Vapi Webhook: {request}")
-    if request.message.type == "end-of-call-report":
-        call_id = request.message.call.id
-        ended_reason = request.message.endedReason
+def apply_vapi_events(messages: List[VapiWebhookMessage]):
+    """
+    Consumer for queued Vapi webhook events: applies a whole batch with one lookup and one commit.
+    """
+    reports = {m.call.id: m for m in messages if m.type == "end-of-call-report"}
+    if not reports:
+        return
 
-        # Find reminder by call_id
-        reminder = session.exec(select(Reminder).where(Reminder.vapi_call_id == call_id)).first()
-        
-        if reminder:
-            print(f"Updating status for reminder {reminder.id} based on call {call_id}. Reason: {ended_reason}")
-            
+    with SessionLocal() as session:
+        reminders = session.exec(select(Reminder).where(Reminder.vapi_call_id.in_(list(reports)))).all()
+        attempts = {
+            attempt.vapi_call_id: attempt
+            for attempt in session.exec(select(CallAttempt).where(CallAttempt.vapi_call_id.in_(list(reports)))).all()
+        }
+        # Read before commit expires the objects, so publishing doesn't reload each row
+        changes = []
+        for reminder in reminders:
+            report = reports[reminder.vapi_call_id]
+            ended_reason = report.endedReason
             if ended_reason in ["assistant-said-end-call-phrase", "customer-ended-call"]:
                 reminder.status = "completed"
             else:
                 # e.g., voicemail, silence-timeout, assistant-error
                 reminder.status = "failed"
-            
             session.add(reminder)
-            session.commit()
-            print(f"Reminder {reminder.id} status updated to {reminder.status}")
-        else:
+            record_event(session, reminder, reminder.status, ended_reason)
+            changes.append((reminder.user_id, reminder.id, reminder.status, reminder.vapi_call_id))
+
+            attempt = attempts.get(reminder.vapi_call_id)
+            if attempt:
+                attempt.status = reminder.status
+                attempt.ended_at = utcnow()
+                attempt.ended_reason = ended_reason
+                attempt.duration_seconds = report.durationSeconds
+                session.add(attempt)
+            print(f"Reminder {reminder.id} status updated to {reminder.status} (call {reminder.vapi_call_id}, reason: {ended_reason})")
+        # Recurring reminders move on to their next occurrence, which clears vapi_call_id
+        handled_call_ids = {reminder.vapi_call_id for reminder in reminders}
+        advanced = advance_series(session, reminders)
+        changes += [(r.user_id, r.id, r.status, r.vapi_call_id) for r in advanced]
+        session.commit()
+        for change in changes:
+            publish_status(*change)
+        schedule_reminders(advanced)
+
+        for call_id in reports.keys() - handled_call_ids:
             print(f"No reminder found for call_id: {call_id}")
-            
+
+webhook_ingestor = WebhookIngestor(apply_vapi_events)
+
+@app.post("/webhook/vapi")
+async def vapi_webhook(request: VapiWebhookRequest):
+    # Acknowledge right away, the ingestor applies events in batches in the background
+    if not webhook_ingestor.enqueue(request.message.event_id(), request.message):
+        raise HTTPException(status_code=503, detail="Webhook queue full, retry later")
     return {"status": "ok"}
 
-@app.delete("/reminders/{reminder_id}")
+@app.delete("/reminders/{reminder_id:int}")
 async def delete_reminder(
     reminder_id: int,
-    user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
 ):
-    reminder = session.exec(select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == user.id)).first()
+    reminder = (await session.exec(select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == user.id))).first()
     if not reminder:
         raise HTTPException(status_code=404, detail="Reminder not found")
     
     # Remove from scheduler if exists
-    job_id = f"reminder_{reminder.id}"
-    try:
-        if scheduler.get_job(job_id):
-            scheduler.remove_job(job_id)
-            print(f"Removed job {job_id}")
-    except Exception as e:
-        print(f"Error removing job {job_id}: {e}")
+    await asyncio.to_thread(unschedule_reminders, [reminder.id])
 
-    session.delete(reminder)
-    session.commit()
+    await session.delete(reminder)
+    await session.commit()
+    total_count_cache.invalidate(user.id)
     return {"message": "Reminder deleted successfully"}
 
 class UpdateReminderRequest(BaseModel):
@@ -329,6 +700,28 @@ class UpdateReminderRequest(BaseModel):
     description: str
     scheduled_time: datetime
     phone_to_call: str
+    # RRULE body, e.g. "FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20270101T000000Z"; scheduled_time starts the series
+    recurrence: Optional[str] = None
+    # IANA zone for a naive scheduled_time and the recurrence's wall-clock time (defaults to the user's, then UTC)
+    timezone: Optional[str] = None
+    # One of the user's call templates (defaults to the user's default template, then the built-in script)
+    template_id: Optional[int] = None
+
+    @field_validator("phone_to_call")
+    @classmethod
+    def validate_phone_to_call(cls, v: str) -> str:
+        # Catches bad numbers here instead of as a failed Vapi call at the scheduled time
+        return normalize_e164(v)
+
+    @field_validator("recurrence")
+    @classmethod
+    def validate_recurrence_rule(cls, v: Optional[str]) -> Optional[str]:
+        return validate_recurrence(v)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone_name(cls, v: Optional[str]) -> Optional[str]:
+        return validate_timezone(v)
 
     @field_validator("title")
     @classmethod
@@ -347,11 +740,6 @@ class UpdateReminderRequest(BaseModel):
     @field_validator("scheduled_time")
     @classmethod
     def validate_future_date(cls, v: datetime) -> datetime:
-        if v.tzinfo:
-            now = datetime.now(v.tzinfo)
-        else:
-            now = datetime.now()
-        
         # For updates, we might allow keeping an old time if not changing it? 
         # But usually you update to a new time. 
         # If the user edits a past reminder, they likely want to reschedule it.
@@ -359,63 +747,247 @@ class UpdateReminderRequest(BaseModel):
         # However, the requirement says "displaying current reminder data and allowing user to update it".
         # If it's a past reminder, updating it to a past time makes no sense for a "Reminder".
         # So we enforce future time for updates too if it's being scheduled.
+        # Naive times are checked by start_series, once their timezone is known.
         
-        if v <= now:
+        if v.tzinfo and to_naive_utc(v) <= utcnow():
             raise ValueError("Scheduled time must be in the future")
         return v
 
-@app.put("/reminders/{reminder_id}")
+def series_settings(reminder: Reminder, reminder_data: UpdateReminderRequest, user: User):
+    """
+    The recurrence and timezone an update leaves the reminder with; omitting them keeps the current ones.
+    """
+    if "recurrence" in reminder_data.model_fields_set:
+        return reminder_data.recurrence, reminder_data.timezone or user.timezone
+    if "timezone" in reminder_data.model_fields_set:
+        return reminder.recurrence, reminder_data.timezone or user.timezone
+    return reminder.recurrence, reminder.timezone or user.timezone
+
+@app.put("/reminders/{reminder_id:int}", response_model=ReminderListItem)
 async def update_reminder(
     reminder_id: int,
     reminder_data: UpdateReminderRequest,
-    user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
 ):
-    reminder = session.exec(select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == user.id)).first()
+    reminder = (await session.exec(select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == user.id))).first()
     if not reminder:
         raise HTTPException(status_code=404, detail="Reminder not found")
 
     reminder.title = reminder_data.title
     reminder.description = reminder_data.description
     reminder.phone_to_call = reminder_data.phone_to_call
+    if "template_id" in reminder_data.model_fields_set:
+        if reminder_data.template_id is not None and not await owned_template_ids(session, user.id, [reminder_data.template_id]):
+            raise HTTPException(status_code=400, detail="Call template not found")
+        reminder.template_id = reminder_data.template_id
     
     old_time = reminder.scheduled_time
-    reminder.scheduled_time = reminder_data.scheduled_time
+    # Editing a series restarts it from the new scheduled time
+    try:
+        start_series(reminder, *series_settings(reminder, reminder_data, user), reminder_data.scheduled_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # If updated to future, ensure it's pending
-    if reminder.scheduled_time > datetime.now(reminder.scheduled_time.tzinfo or None):
+    if reminder.scheduled_time > utcnow():
+        if reminder.status != "pending":
+            # Rescheduling a finished reminder counts against the pending quota like a new one
+            check_pending_quota(await pending_count(session, user.id))
         reminder.status = "pending"
 
     session.add(reminder)
-    session.commit()
-    session.refresh(reminder)
+    await session.commit()
+    await session.refresh(reminder)
+    total_count_cache.invalidate(user.id)
 
-    # Handle Scheduler
-    job_id = f"reminder_{reminder.id}"
-    try:
-        existing_job = scheduler.get_job(job_id)
-        
-        # If exists, reschedule
-        if existing_job:
-            scheduler.reschedule_job(
-                job_id, 
-                trigger='date', 
-                run_date=reminder.scheduled_time
-            )
-            print(f"Rescheduled job {job_id} to {reminder.scheduled_time}")
-        else:
-            # If not exists (e.g. was past/completed), add new if it is in future
-            # (Validator ensures it is in future, so we add it)
-            scheduler.add_job(
-                execute_reminder_call,
-                "date",
-                run_date=reminder.scheduled_time,
-                args=[reminder.id],
-                id=job_id
-            )
-            print(f"Scheduled new job for updated reminder {reminder.id} at {reminder.scheduled_time}")
-
-    except Exception as e:
-        print(f"Error updating schedule for reminder {reminder.id}: {e}")
+    # Replaces the reminder's job (nothing to do in dispatcher mode, the pending row is enough)
+    await asyncio.to_thread(schedule_reminders, [reminder])
 
     return reminder
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+
+class BulkCreateRequest(BaseModel):
+    # Items are validated one by one so a bad row fails alone instead of the whole batch
+    items: List[dict] = PydanticField(max_length=BULK_MAX_ITEMS)
+
+class BulkUpdateRequest(BaseModel):
+    items: List[dict] = PydanticField(max_length=BULK_MAX_ITEMS)
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = PydanticField(max_length=BULK_MAX_ITEMS)
+
+def validation_messages(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+
+class ValidatePhoneNumbersRequest(BaseModel):
+    phone_numbers: List[str] = PydanticField(max_length=BULK_MAX_ITEMS)
+
+@app.post("/phone-numbers/validate")
+async def validate_phone_numbers_batch(
+    request: ValidatePhoneNumbersRequest,
+    user: User = Depends(get_writing_user)
+):
+    """
+    Validates and normalizes a batch of numbers (e.g. before an import) without creating anything.
+    """
+    results = validate_phone_numbers(request.phone_numbers)
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+@app.post("/reminders/bulk")
+async def bulk_create_reminders(
+    request: BulkCreateRequest,
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    results = []
+    created = []
+    trace_parent = current_trace_parent()
+    remaining = remaining_pending_quota(await pending_count(session, user.id))
+    valid = []
+    for index, item in enumerate(request.items):
+        try:
+            reminder_data = CreateReminderRequest.model_validate(item)
+        except ValidationError as e:
+            results.append({"index": index, "ok": False, "errors": validation_messages(e)})
+            continue
+        results.append({"index": index, "ok": True})
+        valid.append((results[-1], reminder_data))
+
+    template_ids = await owned_template_ids(session, user.id, [reminder_data.template_id for _, reminder_data in valid])
+    for result, reminder_data in valid:
+        if reminder_data.template_id is not None and reminder_data.template_id not in template_ids:
+            result["ok"] = False
+            result["errors"] = ["Call template not found"]
+            continue
+        reminder = Reminder(
+            title=reminder_data.title,
+            description=reminder_data.description,
+            scheduled_time=reminder_data.scheduled_time,
+            status="pending",
+            phone_to_call=reminder_data.phone_to_call,
+            user_id=user.id,
+            trace_parent=trace_parent,
+            template_id=reminder_data.template_id
+        )
+        try:
+            start_series(reminder, reminder_data.recurrence, reminder_data.timezone or user.timezone, reminder_data.scheduled_time)
+        except ValueError as e:
+            result["ok"] = False
+            result["errors"] = [str(e)]
+            continue
+        if remaining is not None and len(created) >= remaining:
+            result["ok"] = False
+            result["errors"] = ["Pending reminder limit reached"]
+            continue
+        created.append((result, reminder))
+
+    # One transaction for the whole batch; flushing assigns ids without a refresh per row
+    session.add_all([reminder for _, reminder in created])
+    await session.flush()
+    for result, reminder in created:
+        result["id"] = reminder.id
+    await session.commit()
+    total_count_cache.invalidate(user.id)
+
+    await asyncio.to_thread(schedule_reminders, [reminder for _, reminder in created])
+
+    return {"results": results, "succeeded": len(created), "failed": len(results) - len(created)}
+
+@app.put("/reminders/bulk")
+async def bulk_update_reminders(
+    request: BulkUpdateRequest,
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    results = []
+    valid = []
+    for index, item in enumerate(request.items):
+        reminder_id = item.get("id")
+        if not isinstance(reminder_id, int):
+            results.append({"index": index, "ok": False, "errors": ["id: Field required"]})
+            continue
+        try:
+            reminder_data = UpdateReminderRequest.model_validate(item)
+        except ValidationError as e:
+            results.append({"index": index, "id": reminder_id, "ok": False, "errors": validation_messages(e)})
+            continue
+        results.append({"index": index, "id": reminder_id, "ok": True})
+        valid.append((results[-1], reminder_id, reminder_data))
+
+    # Load every targeted reminder in one query
+    ids = [reminder_id for _, reminder_id, _ in valid]
+    reminders = {
+        reminder.id: reminder
+        for reminder in (await session.exec(select(Reminder).where(Reminder.id.in_(ids), Reminder.user_id == user.id))).all()
+    } if ids else {}
+
+    template_ids = await owned_template_ids(session, user.id, [reminder_data.template_id for _, _, reminder_data in valid])
+    # Finished reminders moved back to pending count against the quota like new ones
+    remaining = remaining_pending_quota(await pending_count(session, user.id))
+    reactivated = 0
+
+    updated = []
+    for result, reminder_id, reminder_data in valid:
+        reminder = reminders.get(reminder_id)
+        if not reminder:
+            result["ok"] = False
+            result["errors"] = ["Reminder not found"]
+            continue
+        if reminder_data.template_id is not None and reminder_data.template_id not in template_ids:
+            result["ok"] = False
+            result["errors"] = ["Call template not found"]
+            continue
+        reactivating = reminder.status != "pending"
+        if reactivating and remaining is not None and reactivated >= remaining:
+            result["ok"] = False
+            result["errors"] = ["Pending reminder limit reached"]
+            continue
+        try:
+            start_series(reminder, *series_settings(reminder, reminder_data, user), reminder_data.scheduled_time)
+        except ValueError as e:
+            result["ok"] = False
+            result["errors"] = [str(e)]
+            continue
+        reactivated += reactivating
+        reminder.title = reminder_data.title
+        reminder.description = reminder_data.description
+        reminder.phone_to_call = reminder_data.phone_to_call
+        if "template_id" in reminder_data.model_fields_set:
+            reminder.template_id = reminder_data.template_id
+        # start_series guarantees a future time, so the reminder is pending again
+        reminder.status = "pending"
+        session.add(reminder)
+        updated.append(reminder)
+
+    await session.commit()
+    total_count_cache.invalidate(user.id)
+
+    await asyncio.to_thread(schedule_reminders, updated)
+
+    return {"results": results, "succeeded": len(updated), "failed": len(results) - len(updated)}
+
+@app.delete("/reminders/bulk")
+async def bulk_delete_reminders(
+    request: BulkDeleteRequest,
+    user: User = Depends(get_writing_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    found = set((await session.exec(
+        select(Reminder.id).where(Reminder.id.in_(request.ids), Reminder.user_id == user.id)
+    )).all()) if request.ids else set()
+
+    await asyncio.to_thread(unschedule_reminders, list(found))
+    if found:
+        await session.execute(delete(Reminder).where(Reminder.id.in_(found)))
+        await session.commit()
+        total_count_cache.invalidate(user.id)
+
+    results = [
+        {"index": index, "id": reminder_id, "ok": True} if reminder_id in found
+        else {"index": index, "id": reminder_id, "ok": False, "errors": ["Reminder not found"]}
+        for index, reminder_id in enumerate(request.ids)
+    ]
+    return {"results": results, "succeeded": len(found), "failed": len(results) - len(found)}
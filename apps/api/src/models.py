@@ -1,23 +1,37 @@
 from typing import Optional
 from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 from pydantic import field_validator, field_serializer
-import phonenumbers
+from src.services.phone import normalize_e164
+
+def utcnow() -> datetime:
+    # Timestamps are stored as naive UTC, like scheduled_time
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def to_naive_utc(v: datetime, tz_name: Optional[str] = None) -> datetime:
+    """
+    Naive UTC for `v`; a naive `v` is read as wall-clock time in `tz_name` (DST-aware), else as UTC.
+    """
+    if v.tzinfo is None:
+        if not tz_name:
+            return v
+        v = v.replace(tzinfo=ZoneInfo(tz_name))
+    return v.astimezone(timezone.utc).replace(tzinfo=None)
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     phone_number: str = Field(index=True, unique=True)
+    # IANA zone for naive reminder times and recurrences that don't name one
+    timezone: Optional[str] = Field(default=None)
+    # Call template for reminders that don't pick one
+    call_template_id: Optional[int] = Field(default=None)
 
     @field_validator("phone_number")
     @classmethod
     def validate_e164(cls, v: str) -> str:
-        try:
-            parsed_number = phonenumbers.parse(v)
-            if not (phonenumbers.is_valid_number(parsed_number) and v.startswith('+')):
-                raise ValueError("Invalid phone number format")
-            return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
-        except Exception:
-            raise ValueError("Phone number must be a valid E.164 formatted number (e.g. +1234567890)")
+        return normalize_e164(v)
 
 class Session(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -26,18 +40,155 @@ class Session(SQLModel, table=True):
     expires_at: datetime
 
 class Reminder(SQLModel, table=True):
+    # Lets the dispatcher range-scan due reminders without touching the rest
+    __table_args__ = (
+        Index("ix_reminder_status_scheduled_time", "status", "scheduled_time"),
+        # Back the per-user listing (and its status filter) in created_at order
+        Index("ix_reminder_user_id_created_at", "user_id", "created_at"),
+        Index("ix_reminder_user_id_status_created_at", "user_id", "status", "created_at"),
+        # Range count behind the upcoming figure of GET /reminders/stats
+        Index("ix_reminder_user_id_status_scheduled_time", "user_id", "status", "scheduled_time"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.now)
+    # Always naive UTC (normalized on write), so due-reminder range scans compare like with like
     scheduled_time: Optional[datetime] = Field(default=None)
     title: str
     description: Optional[str] = None
     status: str = Field(default="pending")
     phone_to_call: str = Field()
     user_id: int = Field(foreign_key="user.id")
-    vapi_call_id: Optional[str] = Field(default=None)
+    vapi_call_id: Optional[str] = Field(default=None, index=True)
+    # W3C traceparent of the request that created the reminder, linked from the call span
+    trace_parent: Optional[str] = Field(default=None)
+    # Which worker claimed the reminder for dispatch, and when
+    claimed_by: Optional[str] = Field(default=None)
+    claimed_at: Optional[datetime] = Field(default=None)
+    # Recurring series: RRULE body (e.g. FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10) evaluated in `timezone`
+    # from `recurrence_start`; the row always holds the next occurrence, numbered by `occurrence`
+    recurrence: Optional[str] = Field(default=None)
+    timezone: Optional[str] = Field(default=None)
+    recurrence_start: Optional[datetime] = Field(default=None)
+    occurrence: Optional[int] = Field(default=None)
+    # Call script; falls back to the user's default template, then the built-in one
+    template_id: Optional[int] = Field(default=None)
 
     @field_serializer("scheduled_time")
     def serialize_scheduled_time(self, v: Optional[datetime], _info):
         if v and v.tzinfo is None:
              return v.replace(tzinfo=timezone.utc)
         return v
+
+class CallTemplate(SQLModel, table=True):
+    """
+    A user's call script: the first message, a str.format template over {title} and {description},
+    plus optional transcriber language and voice.
+    """
+    __tablename__ = "call_template"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    name: str
+    first_message: str
+    # Transcriber language code, e.g. "pt" or "en-US"
+    language: Optional[str] = None
+    voice_provider: Optional[str] = None
+    voice_id: Optional[str] = None
+    created_at: datetime = Field(default_factory=utcnow)
+
+class ReminderStatusCount(SQLModel, table=True):
+    """
+    Live per-user reminder count by status, maintained by database triggers (see services/stats.py).
+    """
+    __tablename__ = "reminder_status_count"
+
+    user_id: int = Field(primary_key=True)
+    status: str = Field(primary_key=True)
+    count: int = 0
+
+class ReminderArchive(SQLModel, table=True):
+    """
+    Finished reminders moved out of the reminder table by the retention job, keeping their id.
+    """
+    __tablename__ = "reminder_archive"
+    __table_args__ = (
+        Index("ix_reminder_archive_user_id_scheduled_time", "user_id", "scheduled_time"),
+        # Backs GET /reminders/archived, keyset-paged in (created_at, id) order
+        Index("ix_reminder_archive_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: int = Field(primary_key=True)
+    created_at: datetime
+    scheduled_time: Optional[datetime] = None
+    title: str
+    description: Optional[str] = None
+    status: str
+    phone_to_call: str
+    user_id: int
+    vapi_call_id: Optional[str] = None
+    trace_parent: Optional[str] = None
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    recurrence: Optional[str] = None
+    timezone: Optional[str] = None
+    recurrence_start: Optional[datetime] = None
+    occurrence: Optional[int] = None
+    template_id: Optional[int] = None
+    archived_at: datetime = Field(default_factory=utcnow, index=True)
+
+    @field_serializer("scheduled_time")
+    def serialize_scheduled_time(self, v: Optional[datetime], _info):
+        if v and v.tzinfo is None:
+             return v.replace(tzinfo=timezone.utc)
+        return v
+
+class ReminderEvent(SQLModel, table=True):
+    """
+    Append-only log of reminder lifecycle transitions.
+    """
+    __tablename__ = "reminder_event"
+    __table_args__ = (
+        Index("ix_reminder_event_reminder_id_created_at", "reminder_id", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # No foreign keys: history outlives deleted reminders
+    reminder_id: int
+    user_id: int
+    type: str
+    status: Optional[str] = None
+    detail: Optional[str] = None
+    occurrence: Optional[int] = None
+    created_at: datetime = Field(default_factory=utcnow, index=True)
+
+class CallAttempt(SQLModel, table=True):
+    """
+    One row per outbound call attempt, completed by the end-of-call webhook.
+    """
+    __tablename__ = "call_attempt"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    reminder_id: int = Field(index=True)
+    user_id: int
+    vapi_call_id: Optional[str] = Field(default=None, index=True)
+    status: str = Field(default="started")
+    scheduled_time: Optional[datetime] = None
+    occurrence: Optional[int] = None
+    started_at: datetime = Field(default_factory=utcnow, index=True)
+    dispatch_lag_seconds: Optional[float] = None
+    request_latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    ended_at: Optional[datetime] = None
+    ended_reason: Optional[str] = None
+    duration_seconds: Optional[float] = None
+
+class SchedulerLease(SQLModel, table=True):
+    """
+    Named lease held by one worker at a time, e.g. the right to run the APScheduler jobs.
+    """
+    __tablename__ = "scheduler_lease"
+
+    name: str = Field(primary_key=True)
+    holder: str
+    expires_at: datetime
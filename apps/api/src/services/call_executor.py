@@ -0,0 +1,184 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Union
+from src.services.metrics import dispatch_lag
+from src.services.rate_limit import RATE_LIMIT_URL, rate_limit_store
+
+CALL_CONCURRENCY = int(os.getenv("CALL_CONCURRENCY", "4"))
+CALL_QUEUE_SIZE = int(os.getenv("CALL_QUEUE_SIZE", "1000"))
+CALL_RATE_PER_SECOND = float(os.getenv("CALL_RATE_PER_SECOND", "5"))
+CALL_RATE_BURST = int(os.getenv("CALL_RATE_BURST", str(max(1, int(CALL_RATE_PER_SECOND)))))
+# With RATE_LIMIT_URL set the call rate is one budget shared by every process, else each process gets its own
+CALL_RATE_SHARED = bool(RATE_LIMIT_URL)
+
+class TokenBucket:
+    """
+    Blocking token bucket: `rate` tokens per second, holding at most `burst`.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class SharedRateLimiter:
+    """
+    Blocking limiter on the shared rate limit store: at most `burst` acquisitions per `burst / rate`
+    seconds for `key`, counted across every process using the store.
+    """
+    def __init__(self, key: str, rate: float, burst: int, store=rate_limit_store):
+        self.key = key
+        self.burst = burst
+        self.window = burst / rate
+        self.store = store
+
+    def acquire(self):
+        while True:
+            wait = self.store.hit(self.key, self.burst, self.window)
+            if not wait:
+                return
+            time.sleep(wait)
+
+class LagStats:
+    """
+    Keeps the most recent dispatch lags (scheduled time vs. actual call start) for percentiles.
+    """
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, scheduled_time: Optional[datetime]):
+        if scheduled_time is None:
+            return
+        # Naive scheduled times are stored as UTC
+        if scheduled_time.tzinfo is None:
+            scheduled_time = scheduled_time.replace(tzinfo=timezone.utc)
+        lag = (datetime.now(timezone.utc) - scheduled_time).total_seconds()
+        dispatch_lag.observe(lag)
+        with self.lock:
+            self.samples.append(lag)
+            self.count += 1
+            self.max = max(self.max, lag)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            samples = sorted(self.samples)
+            count, max_lag = self.count, self.max
+
+        def percentile(p: float) -> Optional[float]:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))], 3)
+
+        return {
+            "count": count,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(max_lag, 3),
+        }
+
+class CallExecutor:
+    """
+    Dedicated call-dispatch stage: a bounded queue drained by a fixed pool of worker threads,
+    with a rate limiter per Vapi phone number ID (shared across processes when `shared`). `submit` blocks while the queue is full,
+    which pushes back on whatever is feeding it (APScheduler jobs or the dispatcher loop).
+    """
+    def __init__(
+        self,
+        handler: Callable[[int], None],
+        concurrency: int = CALL_CONCURRENCY,
+        queue_size: int = CALL_QUEUE_SIZE,
+        rate_per_second: float = CALL_RATE_PER_SECOND,
+        burst: int = CALL_RATE_BURST,
+        shared: bool = CALL_RATE_SHARED,
+    ):
+        self.handler = handler
+        self.concurrency = concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.shared = shared
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.buckets: Dict[str, Union[TokenBucket, SharedRateLimiter]] = {}
+        self.buckets_lock = threading.Lock()
+        self.lag = LagStats()
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+        self.threads = []
+
+    def start(self):
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._worker, name=f"call-executor-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def shutdown(self, wait: bool = True):
+        for _ in self.threads:
+            self.queue.put(None)
+        if wait:
+            for thread in self.threads:
+                thread.join()
+        self.threads = []
+
+    def submit(self, reminder_id: int, rate_key: str = "default", timeout: Optional[float] = None) -> bool:
+        """
+        Enqueues a reminder call. Blocks while the queue is full; returns False if `timeout` runs out.
+        """
+        try:
+            self.queue.put((reminder_id, rate_key), timeout=timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def bucket(self, rate_key: str) -> Union[TokenBucket, SharedRateLimiter]:
+        with self.buckets_lock:
+            if rate_key not in self.buckets:
+                if self.shared:
+                    self.buckets[rate_key] = SharedRateLimiter(f"call_rate:{rate_key}", self.rate_per_second, self.burst)
+                else:
+                    self.buckets[rate_key] = TokenBucket(self.rate_per_second, self.burst)
+            return self.buckets[rate_key]
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "concurrency": self.concurrency,
+            "dispatch_lag_seconds": self.lag.snapshot(),
+        }
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            reminder_id, rate_key = item
+            self.bucket(rate_key).acquire()
+            with self.in_flight_lock:
+                self.in_flight += 1
+            try:
+                self.handler(reminder_id)
+            except Exception as e:
+                print(f"[EXECUTOR] Unhandled error for reminder {reminder_id}: {e}")
+            finally:
+                with self.in_flight_lock:
+                    self.in_flight -= 1
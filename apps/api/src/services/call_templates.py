@@ -0,0 +1,100 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Iterable, Optional, Set
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.models import CallTemplate, Reminder, User
+
+DEFAULT_FIRST_MESSAGE = os.getenv("CALL_FIRST_MESSAGE_TEMPLATE") or (
+    "Hello, this is the Flow Reminder assistant calling you about a reminder for: {title}. Here are the details: {description}"
+)
+# Transcriber that a template's language is passed to
+VAPI_TRANSCRIBER_PROVIDER = os.getenv("VAPI_TRANSCRIBER_PROVIDER", "deepgram")
+# The webhook URL is the same for every call: once the assistant itself points at /webhook/vapi,
+# set this to false to stop repeating it in every call's overrides
+VAPI_SERVER_URL_OVERRIDE = os.getenv("VAPI_SERVER_URL_OVERRIDE", "true").lower() == "true"
+CALL_TEMPLATE_CACHE_SIZE = int(os.getenv("CALL_TEMPLATE_CACHE_SIZE", "1024"))
+TEMPLATE_FIELDS = ("title", "description")
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    first_message: str
+    # Overrides that don't depend on the reminder, built once per template
+    static_overrides: dict
+
+    def render(self, title: str, description: str) -> dict:
+        """
+        Wire (camelCase) assistantOverrides for one call: the static part plus the rendered firstMessage.
+        """
+        overrides = dict(self.static_overrides)
+        overrides["firstMessage"] = self.first_message.format_map({"title": title, "description": description})
+        return overrides
+
+def validate_first_message(text: str) -> str:
+    """
+    Rejects templates str.format can't render: bad braces, unknown fields, indexing or format specs.
+    """
+    if not text.strip():
+        raise ValueError("Message template is required")
+    try:
+        parsed = list(Formatter().parse(text))
+    except ValueError as e:
+        raise ValueError(f"Invalid message template: {e}")
+    for _, field, spec, conversion in parsed:
+        if field is None:
+            continue
+        if field not in TEMPLATE_FIELDS or spec or conversion:
+            allowed = ", ".join(f"{{{name}}}" for name in TEMPLATE_FIELDS)
+            raise ValueError(f"Message template can only use {allowed}, got {{{field}}}")
+    return text
+
+@lru_cache(maxsize=CALL_TEMPLATE_CACHE_SIZE)
+def compile_template(
+    first_message: str = DEFAULT_FIRST_MESSAGE,
+    language: Optional[str] = None,
+    voice_provider: Optional[str] = None,
+    voice_id: Optional[str] = None,
+) -> CompiledTemplate:
+    """
+    Validates a template and builds its static overrides. Cached by content, so an edited
+    template compiles again and every call with an unchanged one reuses the result.
+    """
+    static_overrides = {}
+    if voice_provider and voice_id:
+        static_overrides["voice"] = {"provider": voice_provider, "voiceId": voice_id}
+    if language:
+        static_overrides["transcriber"] = {"provider": VAPI_TRANSCRIBER_PROVIDER, "language": language}
+    server_url = os.getenv("API_PUBLIC_URL")
+    if server_url and VAPI_SERVER_URL_OVERRIDE:
+        static_overrides["server"] = {"url": f"{server_url}/webhook/vapi"}
+    return CompiledTemplate(validate_first_message(first_message), static_overrides)
+
+def compiled(template: Optional[CallTemplate]) -> CompiledTemplate:
+    if template is None:
+        return compile_template()
+    return compile_template(template.first_message, template.language, template.voice_provider, template.voice_id)
+
+def template_for_call(session: Session, reminder: Reminder, user: User) -> CompiledTemplate:
+    """
+    The reminder's own template, else the user's default, else the built-in script.
+    A template deleted in the meantime falls through to the next one.
+    """
+    for template_id in (reminder.template_id, user.call_template_id):
+        if template_id is not None:
+            template = session.get(CallTemplate, template_id)
+            if template and template.user_id == user.id:
+                return compiled(template)
+    return compiled(None)
+
+async def owned_template_ids(session: AsyncSession, user_id: int, template_ids: Iterable[Optional[int]]) -> Set[int]:
+    """
+    The ids among `template_ids` that name one of the user's templates, checked in one query.
+    """
+    ids = {template_id for template_id in template_ids if template_id is not None}
+    if not ids:
+        return set()
+    return set((await session.exec(
+        select(CallTemplate.id).where(CallTemplate.user_id == user_id, CallTemplate.id.in_(ids))
+    )).all())
@@ -0,0 +1,149 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from typing import Callable
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from src.database import engine
+from src.models import Reminder, SchedulerLease, utcnow
+
+# Unique per process, so claims and leases can tell workers apart
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+LEASE_TTL_SECONDS = int(os.getenv("LEASE_TTL_SECONDS", "30"))
+LEASE_RENEW_SECONDS = int(os.getenv("LEASE_RENEW_SECONDS", "10"))
+DISPATCH_CLAIM_TIMEOUT_SECONDS = int(os.getenv("DISPATCH_CLAIM_TIMEOUT_SECONDS", "300"))
+
+def claim_reminder_for_dispatch(reminder_id: int) -> bool:
+    """
+    pending -> dispatching for a single reminder whose job fired, the same claim the dispatcher
+    takes in bulk: while it waits in the call executor queue it no longer looks overdue.
+    """
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(Reminder)
+            .where(Reminder.id == reminder_id, Reminder.status == "pending")
+            .values(status="dispatching", claimed_by=WORKER_ID, claimed_at=utcnow())
+        )
+    return result.rowcount == 1
+
+def claim_reminder_for_call(reminder_id: int) -> bool:
+    """
+    Atomically moves a reminder this worker claimed for dispatch to calling, right before its Vapi call.
+    Every path claims pending -> dispatching before queueing, so a queued item whose reminder was since
+    rescheduled, advanced to its next occurrence or released to another worker sees rowcount 0 and backs off.
+    """
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(Reminder)
+            .where(
+                Reminder.id == reminder_id,
+                Reminder.status == "dispatching",
+                Reminder.claimed_by == WORKER_ID,
+                Reminder.scheduled_time <= utcnow(),
+            )
+            .values(status="calling", claimed_by=WORKER_ID, claimed_at=utcnow())
+        )
+    return result.rowcount == 1
+
+def release_stale_claims(timeout_seconds: int = DISPATCH_CLAIM_TIMEOUT_SECONDS) -> int:
+    """
+    Returns reminders stuck in dispatching (their worker died before calling) to pending.
+    """
+    cutoff = utcnow() - timedelta(seconds=timeout_seconds)
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(Reminder)
+            .where(Reminder.status == "dispatching", or_(Reminder.claimed_at.is_(None), Reminder.claimed_at < cutoff))
+            .values(status="pending", claimed_by=None, claimed_at=None)
+        )
+    if result.rowcount:
+        print(f"[COORDINATION] Released {result.rowcount} stale dispatch claims")
+    return result.rowcount
+
+def try_acquire_lease(name: str, holder: str = WORKER_ID, ttl_seconds: int = LEASE_TTL_SECONDS) -> bool:
+    """
+    Takes or renews the lease if it is free, expired or already ours.
+    """
+    now = utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now))
+            .values(holder=holder, expires_at=expires_at)
+        )
+        if result.rowcount == 1:
+            return True
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(SchedulerLease).values(name=name, holder=holder, expires_at=expires_at))
+            return True
+        except IntegrityError:
+            # Someone else holds it
+            return False
+
+def release_lease(name: str, holder: str = WORKER_ID):
+    with engine.begin() as conn:
+        conn.execute(
+            update(SchedulerLease)
+            .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+            .values(expires_at=utcnow())
+        )
+
+class LeaderElector:
+    """
+    Background thread keeping (or competing for) a lease, calling `on_elected` / `on_demoted`
+    on changes and `on_tick` on every renewal while leader.
+    """
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        on_tick: Callable[[], None] = lambda: None,
+        renew_seconds: int = LEASE_RENEW_SECONDS,
+    ):
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.on_tick = on_tick
+        self.renew_seconds = renew_seconds
+        self.is_leader = False
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self._step()
+        self.thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+        if self.is_leader:
+            # Let another worker take over right away instead of waiting for expiry
+            release_lease(self.name)
+            self.is_leader = False
+
+    def _step(self):
+        try:
+            leader = try_acquire_lease(self.name)
+        except Exception as e:
+            print(f"[COORDINATION] Lease check failed: {e}")
+            leader = False
+        if leader and not self.is_leader:
+            print(f"[COORDINATION] {WORKER_ID} is now leader for {self.name}")
+            self.on_elected()
+        elif not leader and self.is_leader:
+            print(f"[COORDINATION] {WORKER_ID} lost leadership for {self.name}")
+            self.on_demoted()
+        self.is_leader = leader
+        if leader:
+            self.on_tick()
+
+    def _run(self):
+        while not self.stopped.wait(self.renew_seconds):
+            self._step()
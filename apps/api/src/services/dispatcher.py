@@ -0,0 +1,67 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+from sqlalchemy import update
+from sqlmodel import select
+from src.database import SessionLocal
+from src.models import Reminder
+from src.services.vapi import circuit_breaker
+from src.services.coordination import WORKER_ID, release_stale_claims
+from src.services.recovery import CATCH_UP_AFTER_SECONDS
+
+# "jobs" keeps one APScheduler job per reminder, "dispatcher" polls the reminder table instead
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "jobs")
+DISPATCH_INTERVAL_SECONDS = int(os.getenv("DISPATCH_INTERVAL_SECONDS", "5"))
+DISPATCH_BATCH_SIZE = int(os.getenv("DISPATCH_BATCH_SIZE", "100"))
+
+def dispatcher_enabled() -> bool:
+    return SCHEDULER_MODE == "dispatcher"
+
+def claim_due_reminders(limit: int = DISPATCH_BATCH_SIZE) -> List[int]:
+    """
+    Moves up to `limit` due reminders from pending to dispatching and returns their ids.
+    The status check in the UPDATE makes the claim atomic, so any number of workers can poll
+    the same table and a reminder is only ever claimed by one of them.
+    """
+    # Scheduled times are stored as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    due = (
+        select(Reminder.id)
+        # Anything older is left to the reconciliation pass and its catch-up policy
+        .where(
+            Reminder.status == "pending",
+            Reminder.scheduled_time <= now,
+            Reminder.scheduled_time >= now - timedelta(seconds=CATCH_UP_AFTER_SECONDS),
+        )
+        .order_by(Reminder.scheduled_time)
+        .limit(limit)
+    )
+    with SessionLocal() as session:
+        claimed = session.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(due.scalar_subquery()), Reminder.status == "pending")
+            .values(status="dispatching", claimed_by=WORKER_ID, claimed_at=now)
+            .returning(Reminder.id)
+        ).scalars().all()
+        session.commit()
+    return list(claimed)
+
+def dispatch_due_reminders(execute: Callable[[int], None], batch_size: int = DISPATCH_BATCH_SIZE):
+    """
+    Job function called by APScheduler on an interval in dispatcher mode.
+    Claims due reminders batch by batch and hands each one to `execute`.
+    """
+    if circuit_breaker.is_open():
+        # Leave due reminders pending until Vapi recovers
+        return
+
+    release_stale_claims()
+
+    while True:
+        reminder_ids = claim_due_reminders(batch_size)
+        if reminder_ids:
+            print(f"[DISPATCHER] Claimed {len(reminder_ids)} due reminders")
+        for reminder_id in reminder_ids:
+            execute(reminder_id)
+        if len(reminder_ids) < batch_size:
+            break
@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Session, select, func
+from src.models import CallAttempt, Reminder, ReminderEvent, utcnow
+
+def record_event(session: Session, reminder: Reminder, type: str, detail: Optional[str] = None):
+    """
+    Appends a lifecycle event for `reminder`; committed together with the caller's transition.
+    """
+    session.add(ReminderEvent(
+        reminder_id=reminder.id,
+        user_id=reminder.user_id,
+        type=type,
+        status=reminder.status,
+        detail=detail,
+        occurrence=reminder.occurrence,
+    ))
+
+def start_call_attempt(session: Session, reminder: Reminder) -> CallAttempt:
+    started_at = utcnow()
+    attempt = CallAttempt(
+        reminder_id=reminder.id,
+        user_id=reminder.user_id,
+        scheduled_time=reminder.scheduled_time,
+        occurrence=reminder.occurrence,
+        started_at=started_at,
+        dispatch_lag_seconds=(started_at - reminder.scheduled_time).total_seconds() if reminder.scheduled_time else None,
+    )
+    session.add(attempt)
+    return attempt
+
+def call_stats(session: Session, since: datetime, until: datetime) -> dict:
+    """
+    Aggregates over call attempts started in [since, until), a range scan on started_at.
+    """
+    in_range = (CallAttempt.started_at >= since, CallAttempt.started_at < until)
+    by_status = session.exec(
+        select(
+            CallAttempt.status,
+            func.count(),
+            func.avg(CallAttempt.dispatch_lag_seconds),
+            func.max(CallAttempt.dispatch_lag_seconds),
+            func.avg(CallAttempt.request_latency_ms),
+            func.avg(CallAttempt.duration_seconds),
+        ).where(*in_range).group_by(CallAttempt.status)
+    ).all()
+    by_reason = session.exec(
+        select(CallAttempt.ended_reason, func.count())
+        .where(*in_range, CallAttempt.ended_reason.is_not(None))
+        .group_by(CallAttempt.ended_reason)
+    ).all()
+
+    def rounded(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        "since": since,
+        "until": until,
+        "attempts": sum(row[1] for row in by_status),
+        "by_status": {
+            status: {
+                "count": count,
+                "avg_dispatch_lag_seconds": rounded(avg_lag),
+                "max_dispatch_lag_seconds": rounded(max_lag),
+                "avg_request_latency_ms": rounded(avg_latency),
+                "avg_duration_seconds": rounded(avg_duration),
+            }
+            for status, count, avg_lag, max_lag, avg_latency, avg_duration in by_status
+        },
+        "ended_reasons": {reason: count for reason, count in by_reason},
+    }
@@ -0,0 +1,118 @@
+import gzip
+import os
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+import orjson
+from pydantic import BaseModel, field_serializer
+from starlette.requests import Request
+from starlette.responses import Response
+from src.models import Reminder
+
+# Pages whose JSON is at least this big are gzipped for clients that accept it (0 = never)
+LIST_GZIP_MIN_BYTES = int(os.getenv("LIST_GZIP_MIN_BYTES", "4096"))
+LIST_GZIP_LEVEL = int(os.getenv("LIST_GZIP_LEVEL", "5"))
+# Largest page size GET /reminders and GET /reminders/archived accept
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "500"))
+
+# Columns a listing returns by default; claim and trace bookkeeping stays internal
+LIST_FIELDS = (
+    "id", "created_at", "scheduled_time", "title", "description", "status", "phone_to_call", "user_id",
+    "vapi_call_id", "recurrence", "timezone", "recurrence_start", "occurrence", "template_id",
+)
+# Always selected: the keyset cursor is built from them
+CURSOR_FIELDS = ("created_at", "id")
+
+class ReminderListItem(BaseModel):
+    """
+    A reminder as the API returns it (listings, create and update), without the internal bookkeeping columns.
+    """
+    id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    scheduled_time: Optional[datetime] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[str] = None
+    phone_to_call: Optional[str] = None
+    user_id: Optional[int] = None
+    vapi_call_id: Optional[str] = None
+    recurrence: Optional[str] = None
+    timezone: Optional[str] = None
+    recurrence_start: Optional[datetime] = None
+    occurrence: Optional[int] = None
+    template_id: Optional[int] = None
+
+    @field_serializer("scheduled_time")
+    def serialize_scheduled_time(self, v: Optional[datetime], _info):
+        # Stored as naive UTC, sent with its offset like Reminder.serialize_scheduled_time
+        if v and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
+class ReminderPage(BaseModel):
+    """
+    GET /reminders response, declared for the schema; rows are built and encoded without validating them.
+    Offset pages carry `page`/`total_pages`, cursor pages `next_cursor`.
+    """
+    items: List[ReminderListItem]
+    total: Optional[int] = None
+    limit: int
+    page: Optional[int] = None
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+class ArchivedReminderItem(ReminderListItem):
+    archived_at: Optional[datetime] = None
+
+class ArchivedReminderPage(BaseModel):
+    """
+    GET /reminders/archived response.
+    """
+    items: List[ArchivedReminderItem]
+    limit: int
+    next_cursor: Optional[str] = None
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    The columns named by a `fields=` parameter (comma-separated), all of LIST_FIELDS when omitted.
+    """
+    if not fields:
+        return LIST_FIELDS
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in LIST_FIELDS]
+    if unknown or not names:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested")
+    return names
+
+def list_columns(fields: Sequence[str]) -> list:
+    """
+    Columns to select for `fields`, with the cursor columns appended when not requested.
+    """
+    names = list(fields) + [name for name in CURSOR_FIELDS if name not in fields]
+    return [getattr(Reminder, name) for name in names]
+
+def build_items(rows: Sequence, fields: Sequence[str]) -> List[dict]:
+    """
+    Response rows straight from selected column tuples (in list_columns order), no ORM objects.
+    """
+    items = [dict(zip(fields, row)) for row in rows]
+    if "scheduled_time" in fields:
+        # Stored as naive UTC, sent with its offset like Reminder.serialize_scheduled_time
+        for item in items:
+            if item["scheduled_time"] is not None:
+                item["scheduled_time"] = item["scheduled_time"].replace(tzinfo=timezone.utc)
+    return items
+
+def cursor_key(row, fields: Sequence[str]) -> Tuple[datetime, int]:
+    names = list(fields) + [name for name in CURSOR_FIELDS if name not in fields]
+    return row[names.index("created_at")], row[names.index("id")]
+
+def page_response(request: Request, content: dict) -> Response:
+    """
+    Encodes a page with orjson (datetimes as pydantic writes them) and gzips large ones.
+    """
+    body = orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    headers = {"Vary": "Accept-Encoding"}
+    if LIST_GZIP_MIN_BYTES and len(body) >= LIST_GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=LIST_GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type="application/json", headers=headers)
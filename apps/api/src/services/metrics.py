@@ -0,0 +1,94 @@
+import time
+from typing import Optional
+from opentelemetry import trace
+from opentelemetry.propagate import extract, inject
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Spans are no-ops unless an OpenTelemetry SDK/exporter is configured (e.g. opentelemetry-instrument)
+tracer = trace.get_tracer("flow-reminders")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+LAG_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900, 3600)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "SQL statement latency by engine and statement type",
+    ["engine", "operation"], buckets=LATENCY_BUCKETS,
+)
+dispatch_lag = Histogram(
+    "reminder_dispatch_lag_seconds", "Delay between a reminder's scheduled time and its call start",
+    buckets=LAG_BUCKETS,
+)
+scheduler_misfires = Counter("scheduler_misfires_total", "APScheduler jobs that missed their run time")
+reminders_recovered = Counter("reminders_recovered_total", "Overdue or stuck reminders handled by reconciliation", ["action"])
+retention_rows = Counter("retention_rows_total", "Rows removed from hot tables by the retention job", ["kind"])
+rate_limited = Counter("rate_limited_total", "Requests rejected with 429 by rate limit or quota scope", ["scope"])
+scheduler_pending_jobs = Gauge("scheduler_pending_jobs", "Jobs in the APScheduler job store")
+reminders_due = Gauge("reminders_due_pending", "Pending reminders whose scheduled time has passed")
+call_queue_depth = Gauge("call_executor_queued", "Reminder calls waiting in the call executor queue")
+calls_in_flight = Gauge("call_executor_in_flight", "Reminder calls currently being placed")
+vapi_request_duration = Histogram(
+    "vapi_request_duration_seconds", "Vapi API request latency by outcome",
+    ["outcome"], buckets=LATENCY_BUCKETS,
+)
+vapi_errors = Counter("vapi_errors_total", "Vapi call errors by kind", ["kind"])
+vapi_retries = Counter("vapi_retries_total", "Retried Vapi requests")
+vapi_circuit_open = Gauge("vapi_circuit_open", "1 while the Vapi circuit breaker is open")
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    Times every statement run through `engine` (pass `async_engine.sync_engine` for async engines).
+    """
+    # The start time lives on the statement's own execution context, so a failed statement
+    # (no after_cursor_execute) leaves nothing behind on the pooled connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        operation = statement.lstrip().split(" ", 1)[0].upper()
+        db_query_duration.labels(name, operation).observe(time.perf_counter() - started)
+
+async def metrics_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    with tracer.start_as_current_span(f"{request.method} {request.url.path}", kind=trace.SpanKind.SERVER) as span:
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Label by route template so ids in paths don't blow up cardinality
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            span.update_name(f"{request.method} {route_path}")
+            span.set_attribute("http.status_code", status)
+            http_request_duration.labels(request.method, route_path, str(status)).observe(time.perf_counter() - started)
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+def current_trace_parent() -> Optional[str]:
+    """
+    W3C traceparent of the active span, stored on a reminder to link its call back to its creation.
+    """
+    carrier = {}
+    inject(carrier)
+    return carrier.get("traceparent")
+
+def trace_links(trace_parent: Optional[str]) -> list:
+    if not trace_parent:
+        return []
+    span_context = trace.get_current_span(extract({"traceparent": trace_parent})).get_span_context()
+    return [trace.Link(span_context)] if span_context.is_valid else []
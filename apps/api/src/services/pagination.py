@@ -0,0 +1,69 @@
+import base64
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+TOTAL_CACHE_TTL_SECONDS = int(os.getenv("TOTAL_CACHE_TTL_SECONDS", "30"))
+TOTAL_CACHE_KEYS_PER_USER = 32
+TOTAL_CACHE_MAX_USERS = int(os.getenv("TOTAL_CACHE_MAX_USERS", "10000"))
+
+def encode_cursor(created_at: datetime, reminder_id: int) -> str:
+    """
+    Opaque keyset cursor pointing just past (created_at, id).
+    """
+    raw = json.dumps([created_at.isoformat(), reminder_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Raises ValueError for anything that isn't a cursor we issued.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, reminder_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(reminder_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+class TotalCountCache:
+    """
+    Short-lived per-user cache of list totals, keyed by the filters that produced them,
+    in a bounded LRU of users.
+    """
+    def __init__(self, ttl: int = TOTAL_CACHE_TTL_SECONDS, max_users: int = TOTAL_CACHE_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id: int, key: tuple) -> Optional[int]:
+        with self.lock:
+            user_entries = self.entries.get(user_id)
+            if user_entries is None:
+                return None
+            self.entries.move_to_end(user_id)
+            item = user_entries.get(key)
+            if item is None or time.monotonic() - item[1] > self.ttl:
+                return None
+            return item[0]
+
+    def set(self, user_id: int, key: tuple, total: int):
+        with self.lock:
+            user_entries: Dict[tuple, Tuple[int, float]] = self.entries.setdefault(user_id, {})
+            self.entries.move_to_end(user_id)
+            user_entries.pop(key, None)
+            user_entries[key] = (total, time.monotonic())
+            if len(user_entries) > TOTAL_CACHE_KEYS_PER_USER:
+                del user_entries[next(iter(user_entries))]
+            while len(self.entries) > self.max_users:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+total_count_cache = TotalCountCache()
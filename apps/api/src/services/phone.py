@@ -0,0 +1,43 @@
+import os
+from functools import lru_cache
+from typing import List, Optional
+import phonenumbers
+
+PHONE_CACHE_SIZE = int(os.getenv("PHONE_CACHE_SIZE", "10000"))
+E164_ERROR = "Phone number must be a valid E.164 formatted number (e.g. +1234567890)"
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _normalize(value: str) -> Optional[str]:
+    # Invalid numbers are cached too (as None), so repeated bad input is rejected just as cheaply
+    if not value.startswith("+"):
+        return None
+    try:
+        parsed_number = phonenumbers.parse(value)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(parsed_number):
+        return None
+    return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
+
+def normalize_e164(value: str) -> str:
+    """
+    The E.164 form of `value`, which must already be written in international format (leading +).
+    Raises ValueError for anything that isn't a valid, dialable number.
+    """
+    normalized = _normalize(value)
+    if normalized is None:
+        raise ValueError(E164_ERROR)
+    return normalized
+
+def validate_phone_numbers(values: List[str]) -> List[dict]:
+    """
+    Per-number results for a batch, e.g. a contact import, in input order.
+    """
+    results = []
+    for index, value in enumerate(values):
+        normalized = _normalize(value)
+        if normalized is None:
+            results.append({"index": index, "input": value, "ok": False, "errors": [E164_ERROR]})
+        else:
+            results.append({"index": index, "input": value, "ok": True, "phone_number": normalized})
+    return results
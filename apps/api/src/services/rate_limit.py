@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+from src.services.metrics import rate_limited
+
+# Limits are "<requests>/<seconds>"; empty or 0 turns a limit off
+RATE_LIMITS = {
+    "signin_ip": os.getenv("RATE_LIMIT_SIGNIN_PER_IP", "20/60"),
+    "signin_phone": os.getenv("RATE_LIMIT_SIGNIN_PER_PHONE", "5/60"),
+    "user_writes": os.getenv("RATE_LIMIT_USER_WRITES", "120/60"),
+    # Shared by every client, per process unless RATE_LIMIT_URL is set
+    "global_writes": os.getenv("RATE_LIMIT_GLOBAL_WRITES", ""),
+}
+MAX_PENDING_REMINDERS_PER_USER = int(os.getenv("MAX_PENDING_REMINDERS_PER_USER", "1000"))
+# Retry-After sent when the pending quota is full, a hint rather than a window
+QUOTA_RETRY_AFTER_SECONDS = int(os.getenv("QUOTA_RETRY_AFTER_SECONDS", "60"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Optional shared backend across workers, e.g. redis://localhost:6379/0
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL")
+# Take the client IP from X-Forwarded-For (only behind a proxy that sets it)
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+
+class RateLimitExceeded(Exception):
+    def __init__(self, scope: str, retry_after: float, detail: str = "Too many requests"):
+        super().__init__(detail)
+        self.scope = scope
+        self.retry_after = retry_after
+        self.detail = detail
+
+def parse_limit(rule: str) -> Optional[Tuple[int, float]]:
+    if not rule or rule.strip() == "0":
+        return None
+    count, seconds = rule.split("/")
+    return int(count), float(seconds)
+
+class InMemoryRateLimitStore:
+    """
+    Sliding-window log per key: the timestamps of the hits inside the window, in a bounded LRU of keys.
+    """
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self.hits: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        """
+        Records a hit unless it would exceed `limit`; returns 0 when allowed, else seconds until a slot frees up.
+        """
+        now = time.monotonic()
+        with self.lock:
+            hits = self.hits.get(key)
+            if hits is None:
+                hits = self.hits[key] = deque()
+            self.hits.move_to_end(key)
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return hits[0] + window - now
+            hits.append(now)
+            while len(self.hits) > self.max_keys:
+                self.hits.popitem(last=False)
+            return 0.0
+
+class RedisRateLimitStore:
+    """
+    Shared sliding-window log in a sorted set per key. Requires the `redis` package.
+    """
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex[:8]}"
+        redis_key = f"ratelimit:{key}"
+        pipeline = self.client.pipeline()
+        pipeline.zremrangebyscore(redis_key, 0, now - window)
+        pipeline.zadd(redis_key, {member: now})
+        pipeline.zcard(redis_key)
+        pipeline.expire(redis_key, int(window) + 1)
+        _, _, count, _ = pipeline.execute()
+        if count <= limit:
+            return 0.0
+        # Over the limit: take the hit back so rejected requests don't extend the block
+        self.client.zrem(redis_key, member)
+        oldest = self.client.zrange(redis_key, 0, 0, withscores=True)
+        return max(0.0, oldest[0][1] + window - now) if oldest else window
+
+def make_rate_limit_store():
+    if RATE_LIMIT_URL:
+        return RedisRateLimitStore(RATE_LIMIT_URL)
+    return InMemoryRateLimitStore()
+
+rate_limit_store = make_rate_limit_store()
+_limits: Dict[str, Optional[Tuple[int, float]]] = {scope: parse_limit(rule) for scope, rule in RATE_LIMITS.items()}
+
+def check_rate_limit(scope: str, key: str = ""):
+    """
+    Counts a request against `scope` for `key` (a user id, IP or phone number), raising
+    RateLimitExceeded once the scope's limit is reached within its window.
+    """
+    limit = _limits.get(scope)
+    if limit is None:
+        return
+    retry_after = rate_limit_store.hit(f"{scope}:{key}", *limit)
+    if retry_after:
+        rate_limited.labels(scope).inc()
+        raise RateLimitExceeded(scope, retry_after)
+
+def remaining_pending_quota(pending: int) -> Optional[int]:
+    """
+    How many more pending reminders a user with `pending` of them may create, None when uncapped.
+    """
+    if not MAX_PENDING_REMINDERS_PER_USER:
+        return None
+    return max(0, MAX_PENDING_REMINDERS_PER_USER - pending)
+
+def check_pending_quota(pending: int):
+    if remaining_pending_quota(pending) == 0:
+        rate_limited.labels("pending_quota").inc()
+        raise RateLimitExceeded(
+            "pending_quota",
+            QUOTA_RETRY_AFTER_SECONDS,
+            f"Pending reminder limit reached ({MAX_PENDING_REMINDERS_PER_USER})",
+        )
+
+def client_ip(request) -> str:
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
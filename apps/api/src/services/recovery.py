@@ -0,0 +1,183 @@
+import os
+from datetime import timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import and_, insert, or_, update
+from sqlmodel import select
+from src.database import SessionLocal, engine
+from src.models import CallAttempt, Reminder, ReminderEvent, utcnow
+from src.services.coordination import WORKER_ID, release_stale_claims
+from src.services.history import record_event
+from src.services.recurrence import advance_series
+from src.services.metrics import reminders_recovered
+from src.services.status_events import publish_status
+from src.services.vapi import circuit_breaker
+
+# What to do with reminders that are overdue by more than CATCH_UP_AFTER_SECONDS (e.g. after downtime):
+# "call" places them late, "skip" drops them quietly (status skipped), "missed" marks them missed
+CATCH_UP_POLICY = os.getenv("CATCH_UP_POLICY", "call")
+CATCH_UP_AFTER_SECONDS = int(os.getenv("CATCH_UP_AFTER_SECONDS", "60"))
+# With the "call" policy, reminders later than this are marked missed instead (0 = no limit)
+CATCH_UP_MAX_LATENESS_SECONDS = int(os.getenv("CATCH_UP_MAX_LATENESS_SECONDS", "0"))
+CATCH_UP_BATCH_SIZE = int(os.getenv("CATCH_UP_BATCH_SIZE", "100"))
+# Calls that never got an end-of-call report are failed after this long
+CALLING_TIMEOUT_SECONDS = int(os.getenv("CALLING_TIMEOUT_SECONDS", "1800"))
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("RECONCILE_INTERVAL_SECONDS", "60"))
+
+def _overdue_batch(older_than, limit: int):
+    # Walks ix_reminder_status_scheduled_time, oldest first
+    return (
+        select(Reminder.id)
+        .where(Reminder.status == "pending", Reminder.scheduled_time < older_than)
+        .order_by(Reminder.scheduled_time)
+        .limit(limit)
+    )
+
+def claim_overdue_reminders(older_than, limit: int = CATCH_UP_BATCH_SIZE) -> List[int]:
+    """
+    Same atomic pending -> dispatching claim as the dispatcher, restricted to overdue reminders.
+    """
+    with engine.begin() as conn:
+        return list(conn.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(_overdue_batch(older_than, limit).scalar_subquery()), Reminder.status == "pending")
+            .values(status="dispatching", claimed_by=WORKER_ID, claimed_at=utcnow())
+            .returning(Reminder.id)
+        ).scalars().all())
+
+def advance_recurring_reminders(reminder_ids: List[int], reschedule: Optional[Callable[[List[Reminder]], None]] = None):
+    """
+    Moves the recurring reminders among `reminder_ids` (already in a final status) on to their next occurrence.
+    """
+    if not reminder_ids:
+        return
+    with SessionLocal() as session:
+        advanced = advance_series(session, session.exec(
+            select(Reminder).where(Reminder.id.in_(reminder_ids), Reminder.recurrence.is_not(None))
+        ).all())
+        changes = [(reminder.user_id, reminder.id, reminder.status) for reminder in advanced]
+        session.commit()
+        for change in changes:
+            publish_status(*change)
+        if advanced and reschedule:
+            reschedule(advanced)
+
+def close_overdue_reminders(
+    older_than,
+    status: str,
+    limit: int = CATCH_UP_BATCH_SIZE,
+    reschedule: Optional[Callable[[List[Reminder]], None]] = None,
+) -> int:
+    """
+    Moves a batch of overdue pending reminders straight to `status`, with one event each.
+    Recurring reminders then move on to their next occurrence.
+    """
+    with engine.begin() as conn:
+        rows = conn.execute(
+            update(Reminder)
+            .where(Reminder.id.in_(_overdue_batch(older_than, limit).scalar_subquery()), Reminder.status == "pending")
+            .values(status=status)
+            .returning(Reminder.id, Reminder.user_id, Reminder.occurrence, Reminder.recurrence)
+        ).all()
+        if rows:
+            conn.execute(insert(ReminderEvent), [
+                {"reminder_id": reminder_id, "user_id": user_id, "type": status, "status": status,
+                 "detail": "Overdue at startup or after a dispatch backlog", "occurrence": occurrence,
+                 "created_at": utcnow()}
+                for reminder_id, user_id, occurrence, _ in rows
+            ])
+    for reminder_id, user_id, _, _ in rows:
+        publish_status(user_id, reminder_id, status)
+    advance_recurring_reminders([reminder_id for reminder_id, _, _, recurrence in rows if recurrence], reschedule)
+    return len(rows)
+
+def catch_up_overdue_reminders(
+    execute: Callable[[int], None],
+    policy: str = CATCH_UP_POLICY,
+    reschedule: Optional[Callable[[List[Reminder]], None]] = None,
+) -> dict:
+    """
+    Applies the catch-up policy to every pending reminder overdue by more than CATCH_UP_AFTER_SECONDS,
+    batch by batch. Calls go through `execute` (the call executor), whose bounded queue and token bucket
+    pace a large backlog instead of firing it at Vapi all at once.
+    """
+    now = utcnow()
+    counts = {"called": 0, "skipped": 0, "missed": 0}
+    if policy == "call" and CATCH_UP_MAX_LATENESS_SECONDS:
+        while batch := close_overdue_reminders(now - timedelta(seconds=CATCH_UP_MAX_LATENESS_SECONDS), "missed", reschedule=reschedule):
+            counts["missed"] += batch
+    if policy == "call" and circuit_breaker.is_open():
+        # Leave them pending until Vapi recovers
+        return counts
+    older_than = now - timedelta(seconds=CATCH_UP_AFTER_SECONDS)
+    while True:
+        if policy == "call":
+            reminder_ids = claim_overdue_reminders(older_than)
+            for reminder_id in reminder_ids:
+                execute(reminder_id)
+            batch = len(reminder_ids)
+            counts["called"] += batch
+        else:
+            status = "skipped" if policy == "skip" else "missed"
+            batch = close_overdue_reminders(older_than, status, reschedule=reschedule)
+            counts[status] += batch
+        if batch < CATCH_UP_BATCH_SIZE:
+            break
+    return counts
+
+def time_out_stuck_calls(
+    timeout_seconds: int = CALLING_TIMEOUT_SECONDS,
+    reschedule: Optional[Callable[[List[Reminder]], None]] = None,
+) -> int:
+    """
+    Fails reminders left in calling with no end-of-call webhook, along with their open attempt.
+    """
+    cutoff = utcnow() - timedelta(seconds=timeout_seconds)
+    with SessionLocal() as session:
+        reminders = session.exec(
+            select(Reminder).where(
+                Reminder.status == "calling",
+                or_(Reminder.claimed_at < cutoff, and_(Reminder.claimed_at.is_(None), Reminder.scheduled_time < cutoff)),
+            )
+        ).all()
+        if not reminders:
+            return 0
+        attempts = session.exec(
+            select(CallAttempt).where(
+                CallAttempt.reminder_id.in_([reminder.id for reminder in reminders]),
+                CallAttempt.status == "calling",
+            )
+        ).all()
+        for attempt in attempts:
+            attempt.status = "timeout"
+            attempt.ended_at = utcnow()
+            attempt.ended_reason = "no-end-of-call-report"
+            session.add(attempt)
+        for reminder in reminders:
+            reminder.status = "failed"
+            session.add(reminder)
+            record_event(session, reminder, "call_timeout", f"No end-of-call report after {timeout_seconds}s")
+        changes = [(reminder.user_id, reminder.id, reminder.status, reminder.vapi_call_id) for reminder in reminders]
+        advanced = advance_series(session, reminders)
+        changes += [(reminder.user_id, reminder.id, reminder.status, reminder.vapi_call_id) for reminder in advanced]
+        session.commit()
+        for change in changes:
+            publish_status(*change)
+        if advanced and reschedule:
+            reschedule(advanced)
+    return len(reminders)
+
+def reconcile_reminders(execute: Callable[[int], None], reschedule: Optional[Callable[[List[Reminder]], None]] = None):
+    """
+    Job function called by APScheduler right after startup and then on an interval.
+    `reschedule` registers the next occurrence of recurring reminders closed along the way.
+    """
+    timed_out = time_out_stuck_calls(reschedule=reschedule)
+    # Jobs mode has no dispatcher pass to free claims left by a worker that died before calling
+    release_stale_claims()
+    counts = catch_up_overdue_reminders(execute, reschedule=reschedule)
+    counts["timed_out"] = timed_out
+    for action, count in counts.items():
+        if count:
+            reminders_recovered.labels(action).inc(count)
+    if any(counts.values()):
+        print(f"[RECOVERY] Reconciled reminders ({CATCH_UP_POLICY} policy): {counts}")
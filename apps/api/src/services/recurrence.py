@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dateutil.rrule import rrulestr
+from sqlmodel import Session
+from src.models import Reminder, utcnow, to_naive_utc
+from src.services.history import record_event
+
+# Reminders are phone calls, so sub-daily frequencies are not offered
+ALLOWED_FREQUENCIES = {"DAILY", "WEEKLY", "MONTHLY"}
+# A list in any of these would add several calls per day (e.g. BYMINUTE=0,15,30,45)
+TIME_OF_DAY_PARTS = ("BYHOUR", "BYMINUTE", "BYSECOND")
+TERMINAL_STATUSES = {"completed", "failed", "missed", "skipped"}
+
+def validate_timezone(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name}")
+    return name
+
+def _rule_parts(body: str) -> dict:
+    """
+    The rule's NAME=VALUE parts by upper-cased name, read from the text (rrule keeps them private).
+    """
+    parts = {}
+    for part in body.split(";"):
+        name, _, value = part.partition("=")
+        if name.strip():
+            parts[name.strip().upper()] = value.strip().upper()
+    return parts
+
+def parse_recurrence(rule: str, start: datetime, tz_name: Optional[str] = None):
+    """
+    Parses an RRULE body such as "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10" anchored at `start`
+    (naive UTC). Occurrences are computed in `tz_name`, so they keep their wall-clock time across DST.
+    """
+    tz = ZoneInfo(tz_name or "UTC")
+    local_start = start.replace(tzinfo=timezone.utc).astimezone(tz)
+    body = rule.strip()
+    if body.upper().startswith("RRULE:"):
+        body = body[len("RRULE:"):]
+    if "\n" in body:
+        raise ValueError("Recurrence must be a single RRULE")
+    parts = _rule_parts(body)
+    if parts.get("FREQ") not in ALLOWED_FREQUENCIES:
+        raise ValueError("Recurrence must be DAILY, WEEKLY or MONTHLY")
+    for name in TIME_OF_DAY_PARTS:
+        if len(parts.get(name, "").split(",")) > 1:
+            raise ValueError(f"Recurrence allows one call per day, {name} takes a single value")
+    try:
+        parsed = rrulestr(body, dtstart=local_start)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}")
+    return parsed
+
+def validate_recurrence(rule: Optional[str]) -> Optional[str]:
+    if rule is None or not rule.strip():
+        return None
+    parse_recurrence(rule, utcnow())
+    return rule.strip()
+
+def _local(value: datetime, tz: ZoneInfo) -> datetime:
+    return value.replace(tzinfo=timezone.utc).astimezone(tz)
+
+def _utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def first_occurrence(rule: str, start: datetime, tz_name: Optional[str] = None) -> datetime:
+    """
+    The first occurrence at or after `start` (naive UTC), which need not match the rule itself.
+    """
+    occurrence = parse_recurrence(rule, start, tz_name).after(_local(start, ZoneInfo(tz_name or "UTC")), inc=True)
+    if occurrence is None:
+        raise ValueError("Recurrence rule has no occurrences after the scheduled time")
+    return _utc(occurrence)
+
+def start_series(reminder: Reminder, rule: Optional[str], tz_name: Optional[str], start: datetime):
+    """
+    Sets up `reminder` as occurrence 1 of a series starting at `start`, or as a one-off without `rule`.
+    A naive `start` is wall-clock time in `tz_name` (UTC without one); it is stored as naive UTC.
+    """
+    start = to_naive_utc(start, tz_name)
+    if start <= utcnow():
+        raise ValueError("Scheduled time must be in the future")
+    if rule:
+        # rrule works in whole seconds
+        start = start.replace(microsecond=0)
+        # Computed first so an invalid rule leaves the reminder untouched
+        scheduled_time = first_occurrence(rule, start, tz_name)
+        reminder.recurrence_start = start
+        reminder.scheduled_time = scheduled_time
+        reminder.occurrence = 1
+    else:
+        reminder.recurrence_start = None
+        reminder.scheduled_time = start
+        reminder.occurrence = None
+    reminder.recurrence = rule
+    reminder.timezone = tz_name
+
+def advance_recurrence(session: Session, reminder: Reminder) -> bool:
+    """
+    Once an occurrence reaches a final status, moves the series row on to its next occurrence
+    (skipping any that already passed) and records it. The series keeps a single row and a
+    single pending job/dispatch entry however long it runs. Returns False when the series ended.
+    """
+    if not reminder.recurrence or reminder.status not in TERMINAL_STATUSES:
+        return False
+    current = reminder.scheduled_time
+    tz = ZoneInfo(reminder.timezone or "UTC")
+    rule = parse_recurrence(reminder.recurrence, reminder.recurrence_start or current, reminder.timezone)
+    upcoming = rule.after(_local(max(current, utcnow()), tz))
+    if upcoming is None:
+        return False
+    skipped = len(rule.between(_local(current, tz), upcoming))
+    reminder.occurrence = (reminder.occurrence or 1) + skipped + 1
+    reminder.scheduled_time = _utc(upcoming)
+    reminder.status = "pending"
+    reminder.vapi_call_id = None
+    reminder.claimed_by = None
+    reminder.claimed_at = None
+    session.add(reminder)
+    record_event(session, reminder, "occurrence_scheduled", f"Occurrence {reminder.occurrence} at {reminder.scheduled_time.isoformat()}Z")
+    return True
+
+def advance_series(session: Session, reminders: List[Reminder]) -> List[Reminder]:
+    """
+    Advances every recurring reminder in `reminders`; returns the ones now pending their next occurrence.
+    """
+    return [reminder for reminder in reminders if advance_recurrence(session, reminder)]
@@ -0,0 +1,92 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, literal, select, text
+from src.database import engine
+from src.models import Reminder, ReminderArchive, Session as DbSession, utcnow
+from src.services.metrics import retention_rows
+from src.services.pagination import total_count_cache
+
+# Finished reminders older than this (by scheduled time) move to reminder_archive; 0 disables archiving
+REMINDER_ARCHIVE_AFTER_DAYS = int(os.getenv("REMINDER_ARCHIVE_AFTER_DAYS", "30"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+RETENTION_INTERVAL_SECONDS = int(os.getenv("RETENTION_INTERVAL_SECONDS", "3600"))
+# Free pages handed back per run with SQLite incremental auto-vacuum (0 = all of them)
+SQLITE_VACUUM_PAGES = int(os.getenv("SQLITE_VACUUM_PAGES", "10000"))
+FINISHED_STATUSES = ("completed", "failed", "missed", "skipped")
+
+def purge_expired_sessions(batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """
+    Deletes expired sessions batch by batch, keeping each write transaction short.
+    Cached entries need no invalidation: the session cache checks expiry itself.
+    """
+    purged = 0
+    while True:
+        # Session expiry is stored as naive local time, like the check in get_current_user
+        expired = select(DbSession.id).where(DbSession.expires_at < datetime.now()).limit(batch_size)
+        with engine.begin() as conn:
+            count = conn.execute(delete(DbSession).where(DbSession.id.in_(expired.scalar_subquery()))).rowcount
+        purged += count
+        if count < batch_size:
+            return purged
+
+def archive_finished_reminders(older_than: datetime, batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """
+    Copies finished reminders scheduled before `older_than` into reminder_archive and deletes them,
+    one batch per transaction. History rows keep pointing at the same ids.
+    """
+    columns = [column.name for column in Reminder.__table__.columns]
+    archived = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(Reminder.id, Reminder.user_id)
+                .where(Reminder.status.in_(FINISHED_STATUSES), Reminder.scheduled_time < older_than)
+                .order_by(Reminder.scheduled_time)
+                .limit(batch_size)
+            ).all()
+            ids = [reminder_id for reminder_id, _ in rows]
+            if ids:
+                conn.execute(
+                    insert(ReminderArchive).from_select(
+                        columns + ["archived_at"],
+                        select(*[Reminder.__table__.c[name] for name in columns], literal(utcnow()))
+                        .where(Reminder.id.in_(ids)),
+                    )
+                )
+                conn.execute(delete(Reminder).where(Reminder.id.in_(ids)))
+        for user_id in {user_id for _, user_id in rows}:
+            total_count_cache.invalidate(user_id)
+        archived += len(ids)
+        if len(ids) < batch_size:
+            return archived
+
+def compact_database():
+    """
+    Hands freed pages back and refreshes planner statistics after a purge.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            # Only databases created with auto_vacuum=INCREMENTAL (see database.py) can shrink incrementally
+            if conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+                pages = f"({SQLITE_VACUUM_PAGES})" if SQLITE_VACUUM_PAGES else ""
+                conn.execute(text(f"PRAGMA incremental_vacuum{pages}"))
+            conn.execute(text("PRAGMA optimize"))
+    elif engine.dialect.name == "postgresql":
+        tables = ", ".join(engine.dialect.identifier_preparer.format_table(model.__table__) for model in (DbSession, Reminder))
+        # VACUUM can't run inside a transaction
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"VACUUM (ANALYZE) {tables}"))
+
+def run_retention():
+    """
+    Job function called by APScheduler on an interval.
+    """
+    sessions = purge_expired_sessions()
+    reminders = 0
+    if REMINDER_ARCHIVE_AFTER_DAYS:
+        reminders = archive_finished_reminders(utcnow() - timedelta(days=REMINDER_ARCHIVE_AFTER_DAYS))
+    retention_rows.labels("sessions").inc(sessions)
+    retention_rows.labels("reminders").inc(reminders)
+    if sessions or reminders:
+        compact_database()
+        print(f"[RETENTION] Purged {sessions} expired sessions, archived {reminders} reminders")
@@ -0,0 +1,322 @@
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+from sqlalchemy import text
+from sqlmodel import select, func
+from src.database import SessionLocal, scheduler_engine
+from src.models import User, Reminder, utcnow
+from src.services.vapi import make_reminder_call, circuit_breaker, VAPI_PHONE_NUMBER_ID, VAPI_BREAKER_RESET_SECONDS, CircuitOpenError
+from src.services.call_executor import CallExecutor
+from src.services.coordination import LeaderElector, claim_reminder_for_call, claim_reminder_for_dispatch
+from src.services.history import record_event, start_call_attempt
+from src.services.metrics import (
+    tracer, trace_links, scheduler_misfires, scheduler_pending_jobs, reminders_due,
+    call_queue_depth, calls_in_flight, vapi_circuit_open
+)
+from src.services.dispatcher import dispatcher_enabled, dispatch_due_reminders, DISPATCH_INTERVAL_SECONDS
+from src.services.status_events import publish_status
+from src.services.recovery import reconcile_reminders, CATCH_UP_AFTER_SECONDS, RECONCILE_INTERVAL_SECONDS
+from src.services.recurrence import advance_recurrence
+from src.services.phone import normalize_e164
+from src.services.call_templates import template_for_call
+from src.services.retention import run_retention, RETENTION_INTERVAL_SECONDS
+from src.services.stats import repair_status_counts, STATS_REPAIR_INTERVAL_SECONDS
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.events import EVENT_JOB_MISSED
+
+scheduler = BackgroundScheduler(
+    jobstores={
+        'default': SQLAlchemyJobStore(engine=scheduler_engine),
+        'memory': MemoryJobStore(),
+    },
+    # Jobs later than this are dropped by APScheduler; the reconciliation pass picks their reminders up
+    job_defaults={'misfire_grace_time': CATCH_UP_AFTER_SECONDS, 'coalesce': True},
+)
+scheduler.add_listener(lambda event: scheduler_misfires.inc(), EVENT_JOB_MISSED)
+
+# With several processes sharing the job store, a lease keeps per-reminder jobs running in one of them.
+# Renewals also wake the leader so it notices jobs other processes added.
+SCHEDULER_LEADER_ELECTION = os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() == "true"
+scheduler_elector = LeaderElector("scheduler", on_elected=scheduler.resume, on_demoted=scheduler.pause, on_tick=scheduler.wakeup)
+# Housekeeping (retention, counter repair) is scheduled in every process but run by one lease holder at a time.
+# Where every scheduler runs (dispatcher mode, no leader election) it has a lease of its own; a lease-paused
+# scheduler only runs jobs in the scheduler lease holder, so that lease decides there
+maintenance_elector = LeaderElector("maintenance", on_elected=lambda: None, on_demoted=lambda: None)
+scheduler_lease_paused = False
+
+def run_maintenance(job: Callable[[], object]):
+    """
+    Job function called by APScheduler: runs `job` only in the process holding the housekeeping lease.
+    """
+    elector = scheduler_elector if scheduler_lease_paused else maintenance_elector
+    if elector.is_leader:
+        job()
+
+def start_scheduling(run_calls: bool = True):
+    """
+    Starts the scheduler. With `run_calls` this process also places calls (call executor,
+    per-reminder jobs or the dispatcher loop); without it the scheduler stays paused and
+    only writes jobs to the shared store for a worker process to run.
+    """
+    global scheduler_lease_paused
+    if not run_calls:
+        scheduler.start(paused=True)
+        print("Scheduler started in enqueue-only mode")
+        return
+    call_executor.start()
+    if dispatcher_enabled() or not SCHEDULER_LEADER_ELECTION:
+        scheduler.start()
+    else:
+        # Every process writes jobs to the shared store, only the lease holder runs them
+        scheduler.start(paused=True)
+        scheduler_lease_paused = True
+        scheduler_elector.start()
+    print("Scheduler started")
+    if dispatcher_enabled():
+        # A single polling job replaces the per-reminder jobs
+        scheduler.add_job(
+            dispatch_due_reminders,
+            "interval",
+            seconds=DISPATCH_INTERVAL_SECONDS,
+            args=[submit_reminder_call],
+            id="reminder_dispatcher",
+            jobstore="memory",
+            coalesce=True,
+            max_instances=1,
+            replace_existing=True
+        )
+        print(f"Reminder dispatcher polling every {DISPATCH_INTERVAL_SECONDS}s")
+    # First pass right away but in the background, so a large backlog doesn't hold up startup
+    scheduler.add_job(
+        reconcile_reminders,
+        "interval",
+        seconds=RECONCILE_INTERVAL_SECONDS,
+        next_run_time=datetime.now(),
+        args=[submit_reminder_call, schedule_reminders],
+        id="reminder_reconciler",
+        jobstore="memory",
+        coalesce=True,
+        max_instances=1,
+        replace_existing=True
+    )
+    if not scheduler_lease_paused:
+        maintenance_elector.start()
+    scheduler.add_job(
+        run_maintenance,
+        "interval",
+        seconds=RETENTION_INTERVAL_SECONDS,
+        args=[run_retention],
+        id="retention",
+        jobstore="memory",
+        coalesce=True,
+        max_instances=1,
+        replace_existing=True
+    )
+    scheduler.add_job(
+        run_maintenance,
+        "interval",
+        seconds=STATS_REPAIR_INTERVAL_SECONDS,
+        args=[repair_status_counts],
+        id="stats_repair",
+        jobstore="memory",
+        coalesce=True,
+        max_instances=1,
+        replace_existing=True
+    )
+
+def stop_scheduling():
+    scheduler_elector.shutdown()
+    maintenance_elector.shutdown()
+    scheduler.shutdown()
+    print("Scheduler shut down")
+    if call_executor.threads:
+        call_executor.shutdown()
+
+def submit_reminder_call(reminder_id: int):
+    """
+    Hands an already claimed (dispatching) reminder to the call executor, blocking while its queue is full.
+    """
+    call_executor.submit(reminder_id, rate_key=VAPI_PHONE_NUMBER_ID or "default")
+
+def execute_reminder_call(reminder_id: int):
+    """
+    Job function called by APScheduler.
+    Claims the reminder first, so the reconciler doesn't take it for overdue while it waits in the queue.
+    """
+    print(f"[SCHEDULER] Job started for reminder_id: {reminder_id}")
+    if not claim_reminder_for_dispatch(reminder_id):
+        print(f"Reminder {reminder_id} is no longer pending, skipping")
+        return
+    submit_reminder_call(reminder_id)
+
+def schedule_reminder_job(reminder_id: int, run_date: datetime):
+    """
+    Registers (or replaces) the single job that calls `reminder_id` at `run_date`.
+    """
+    scheduler.add_job(
+        execute_reminder_call,
+        "date",
+        run_date=run_date,
+        args=[reminder_id],
+        id=f"reminder_{reminder_id}",
+        replace_existing=True
+    )
+
+def schedule_reminders(reminders: List[Reminder]):
+    """
+    Registers (or replaces) the jobs of a batch of reminders, one-off or the current occurrence of a series.
+    In dispatcher mode the committed pending rows already are the schedule, so this costs nothing.
+    Job store writes block: async handlers call it through asyncio.to_thread.
+    """
+    if dispatcher_enabled():
+        return
+    for reminder in reminders:
+        try:
+            # Stored as naive UTC
+            schedule_reminder_job(reminder.id, reminder.scheduled_time.replace(tzinfo=timezone.utc))
+        except Exception as e:
+            print(f"Error scheduling reminder {reminder.id}: {e}")
+
+def unschedule_reminders(reminder_ids: List[int]):
+    if dispatcher_enabled():
+        return
+    for reminder_id in reminder_ids:
+        job_id = f"reminder_{reminder_id}"
+        try:
+            if scheduler.get_job(job_id):
+                scheduler.remove_job(job_id)
+        except Exception as e:
+            print(f"Error removing job {job_id}: {e}")
+
+def commit_call_outcome(session, reminder: Reminder):
+    """
+    Commits the call outcome; a recurring reminder whose call failed moves on to its next occurrence.
+    """
+    changes = [(reminder.user_id, reminder.id, reminder.status, reminder.vapi_call_id)]
+    advanced = advance_recurrence(session, reminder)
+    if advanced:
+        changes.append((reminder.user_id, reminder.id, reminder.status, reminder.vapi_call_id))
+    session.commit()
+    for change in changes:
+        publish_status(*change)
+    if advanced:
+        schedule_reminders([reminder])
+
+def place_reminder_call(reminder_id: int):
+    """
+    Runs on a call executor worker once a rate-limit token is available.
+    """
+    with SessionLocal() as session, tracer.start_as_current_span("reminder.call") as span:
+        span.set_attribute("reminder.id", reminder_id)
+        # Only the worker holding the dispatch claim, for a reminder still due, places the call
+        if not claim_reminder_for_call(reminder_id):
+            print(f"Reminder {reminder_id} is no longer claimed by this worker or not due, skipping")
+            return
+
+        reminder = session.exec(select(Reminder).where(Reminder.id == reminder_id)).first()
+        if not reminder:
+            print(f"Reminder {reminder_id} not found")
+            return
+
+        # Ties the call back to the request that created the reminder
+        for link in trace_links(reminder.trace_parent):
+            span.add_link(link.context)
+
+        user = session.get(User, reminder.user_id)
+        if not user:
+            print(f"User for reminder {reminder_id} not found")
+            reminder.status = "failed"
+            session.add(reminder)
+            commit_call_outcome(session, reminder)
+            return
+
+        # Rows stored before phone_to_call was validated may hold numbers Vapi would only reject
+        try:
+            normalize_e164(reminder.phone_to_call)
+        except ValueError as e:
+            print(f"Invalid phone number for reminder {reminder_id}, not calling")
+            reminder.status = "failed"
+            record_event(session, reminder, "call_failed", str(e))
+            session.add(reminder)
+            commit_call_outcome(session, reminder)
+            return
+
+        print(f"Executing call for reminder {reminder.id} to {reminder.phone_to_call}")
+        call_executor.lag.observe(reminder.scheduled_time)
+        attempt = start_call_attempt(session, reminder)
+        request_started = time.perf_counter()
+
+        try:
+            call = make_reminder_call(
+                phone_number=reminder.phone_to_call,
+                title=reminder.title,
+                description=reminder.description or "",
+                template=template_for_call(session, reminder, user)
+            )
+            attempt.request_latency_ms = (time.perf_counter() - request_started) * 1000
+
+            if call and hasattr(call, 'id'):
+                reminder.vapi_call_id = call.id
+                reminder.status = "calling"
+                attempt.vapi_call_id = call.id
+                attempt.status = "calling"
+                print(f"Call initiated for reminder {reminder.id}, call_id: {call.id}")
+            else:
+                reminder.status = "failed"
+                attempt.status = "failed"
+                attempt.error = "Call was not created"
+                print(f"Failed to initiate call for reminder {reminder.id}")
+
+            record_event(session, reminder, "call_started" if reminder.status == "calling" else "call_failed", attempt.error)
+            session.add(reminder)
+            session.add(attempt)
+            commit_call_outcome(session, reminder)
+        except CircuitOpenError:
+            # Vapi is down: keep the reminder pending instead of failing it, and try again later
+            print(f"Vapi circuit open, deferring reminder {reminder.id}")
+            reminder.status = "pending"
+            attempt.status = "deferred"
+            attempt.error = "Vapi circuit breaker open"
+            record_event(session, reminder, "call_deferred", attempt.error)
+            session.add(reminder)
+            session.add(attempt)
+            session.commit()
+            publish_status(reminder.user_id, reminder.id, reminder.status, reminder.vapi_call_id)
+            if not dispatcher_enabled():
+                schedule_reminder_job(reminder.id, datetime.now() + timedelta(seconds=VAPI_BREAKER_RESET_SECONDS))
+        except Exception as e:
+            print(f"Error triggered for reminder {reminder.id}: {e}")
+            reminder.status = "failed"
+            attempt.request_latency_ms = (time.perf_counter() - request_started) * 1000
+            attempt.status = "failed"
+            attempt.error = str(e)[:500]
+            record_event(session, reminder, "call_failed", attempt.error)
+            session.add(reminder)
+            session.add(attempt)
+            commit_call_outcome(session, reminder)
+
+call_executor = CallExecutor(place_reminder_call)
+
+def count_scheduler_jobs() -> int:
+    try:
+        with scheduler_engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM apscheduler_jobs")).scalar()
+    except Exception:
+        return 0
+
+def count_due_reminders() -> int:
+    with SessionLocal() as session:
+        return session.exec(
+            select(func.count()).select_from(Reminder).where(Reminder.status == "pending", Reminder.scheduled_time <= utcnow())
+        ).one()
+
+# Gauges are evaluated on scrape
+scheduler_pending_jobs.set_function(count_scheduler_jobs)
+reminders_due.set_function(count_due_reminders)
+call_queue_depth.set_function(lambda: call_executor.queue.qsize())
+calls_in_flight.set_function(lambda: call_executor.in_flight)
+vapi_circuit_open.set_function(lambda: 1 if circuit_breaker.is_open() else 0)
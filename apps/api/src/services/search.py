@@ -0,0 +1,102 @@
+import os
+import re
+from typing import Optional
+from sqlalchemy import Float, Integer, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+# "fts" ranks matches from the full-text index, "like" keeps the substring scan
+DEFAULT_SEARCH_MODE = os.getenv("DEFAULT_SEARCH_MODE", "fts")
+
+def _terms(query: str) -> list:
+    return re.findall(r"\w+", query.lower())
+
+class SqliteFtsBackend:
+    """
+    FTS5 external-content index over reminder title/description, kept in sync by triggers
+    so every write path (including raw updates) updates it in the same transaction.
+    """
+    def setup(self, engine: Engine) -> bool:
+        with engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reminder_fts'"
+            )).first()
+            try:
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS reminder_fts USING fts5("
+                    "title, description, content='reminder', content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+                ))
+            except OperationalError as e:
+                print(f"FTS5 unavailable, search falls back to LIKE: {e}")
+                return False
+            conn.execute(text(
+                "CREATE TRIGGER IF NOT EXISTS reminder_fts_ai AFTER INSERT ON reminder BEGIN "
+                "INSERT INTO reminder_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+                "END"
+            ))
+            conn.execute(text(
+                "CREATE TRIGGER IF NOT EXISTS reminder_fts_ad AFTER DELETE ON reminder BEGIN "
+                "INSERT INTO reminder_fts(reminder_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+                "END"
+            ))
+            # Only text changes touch the index, status updates from the dispatcher don't
+            conn.execute(text(
+                "CREATE TRIGGER IF NOT EXISTS reminder_fts_au AFTER UPDATE OF title, description ON reminder BEGIN "
+                "INSERT INTO reminder_fts(reminder_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description); "
+                "INSERT INTO reminder_fts(rowid, title, description) VALUES (new.id, new.title, new.description); "
+                "END"
+            ))
+            if not exists:
+                # Index rows written before the FTS table existed
+                conn.execute(text("INSERT INTO reminder_fts(reminder_fts) VALUES ('rebuild')"))
+        return True
+
+    def match(self, query: str):
+        """
+        Subquery of (reminder_id, rank) for rows matching every term as a prefix.
+        Lower rank is better, title hits weigh double.
+        """
+        match_query = " ".join(f'"{term}"*' for term in _terms(query))
+        return text(
+            "SELECT rowid AS reminder_id, bm25(reminder_fts, 2.0, 1.0) AS rank FROM reminder_fts WHERE reminder_fts MATCH :q"
+        ).bindparams(q=match_query).columns(reminder_id=Integer, rank=Float).subquery("search_match")
+
+class PostgresFtsBackend:
+    """
+    tsvector search on Postgres through an expression GIN index, which needs no sync at all.
+    """
+    DOCUMENT = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+    def setup(self, engine: Engine) -> bool:
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_reminder_fts ON reminder USING gin ({self.DOCUMENT})"))
+        return True
+
+    def match(self, query: str):
+        ts_query = " & ".join(f"{term}:*" for term in _terms(query))
+        return text(
+            f"SELECT id AS reminder_id, -ts_rank({self.DOCUMENT}, to_tsquery('simple', :q)) AS rank "
+            f"FROM reminder WHERE {self.DOCUMENT} @@ to_tsquery('simple', :q)"
+        ).bindparams(q=ts_query).columns(reminder_id=Integer, rank=Float).subquery("search_match")
+
+_backend = None
+
+def setup_search(engine: Engine):
+    global _backend
+    backends = {"sqlite": SqliteFtsBackend, "postgresql": PostgresFtsBackend}
+    backend_class = backends.get(engine.dialect.name)
+    if backend_class is None:
+        return
+    backend = backend_class()
+    if backend.setup(engine):
+        _backend = backend
+
+def search_backend() -> Optional[object]:
+    """
+    The active full-text backend, or None when only LIKE search is available.
+    """
+    return _backend
+
+def has_search_terms(query: str) -> bool:
+    return bool(_terms(query))
@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+SESSION_CACHE_TTL_SECONDS = int(os.getenv("SESSION_CACHE_TTL_SECONDS", "300"))
+SESSION_CACHE_MAX_SIZE = int(os.getenv("SESSION_CACHE_MAX_SIZE", "10000"))
+# Optional shared backend across workers, e.g. redis://localhost:6379/0
+SESSION_CACHE_URL = os.getenv("SESSION_CACHE_URL")
+
+class InMemorySessionCache:
+    """
+    Bounded LRU of token -> cached session entry, each entry living at most `ttl` seconds.
+    """
+    def __init__(self, ttl: int = SESSION_CACHE_TTL_SECONDS, max_size: int = SESSION_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self.lock:
+            item = self.entries.get(token)
+            if item is None:
+                return None
+            entry, stored_at = item
+            if time.monotonic() - stored_at > self.ttl:
+                del self.entries[token]
+                return None
+            self.entries.move_to_end(token)
+            return entry
+
+    def set(self, token: str, entry: dict):
+        with self.lock:
+            self.entries[token] = (entry, time.monotonic())
+            self.entries.move_to_end(token)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, token: str):
+        with self.lock:
+            self.entries.pop(token, None)
+
+class RedisSessionCache:
+    """
+    Shared cache for multi-worker deployments. Requires the `redis` package.
+    """
+    def __init__(self, url: str, ttl: int = SESSION_CACHE_TTL_SECONDS):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, token: str) -> Optional[dict]:
+        value = self.client.get(f"session:{token}")
+        return json.loads(value) if value else None
+
+    def set(self, token: str, entry: dict):
+        self.client.set(f"session:{token}", json.dumps(entry), ex=self.ttl)
+
+    def delete(self, token: str):
+        self.client.delete(f"session:{token}")
+
+def make_session_cache():
+    if SESSION_CACHE_URL:
+        return RedisSessionCache(SESSION_CACHE_URL)
+    return InMemorySessionCache()
+
+session_cache = make_session_cache()
+
+def cache_session(token: str, user_id: int, phone_number: str, expires_at: datetime, timezone: Optional[str] = None, call_template_id: Optional[int] = None):
+    session_cache.set(token, {
+        "user_id": user_id,
+        "phone_number": phone_number,
+        "timezone": timezone,
+        "call_template_id": call_template_id,
+        "expires_at": expires_at.isoformat(),
+    })
+
+def get_cached_session(token: str) -> Optional[dict]:
+    """
+    Returns the cached entry for `token`, dropping it once the session itself has expired.
+    """
+    entry = session_cache.get(token)
+    if entry is None:
+        return None
+    if datetime.fromisoformat(entry["expires_at"]) < datetime.now():
+        session_cache.delete(token)
+        return None
+    return entry
+
+def invalidate_session(token: str):
+    session_cache.delete(token)
@@ -0,0 +1,141 @@
+import os
+from datetime import timedelta
+from sqlalchemy import delete, insert, text
+from sqlalchemy.engine import Engine
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.database import engine
+from src.models import Reminder, ReminderStatusCount, utcnow
+
+STATS_REPAIR_INTERVAL_SECONDS = int(os.getenv("STATS_REPAIR_INTERVAL_SECONDS", "3600"))
+UPCOMING_WINDOW_HOURS = 24
+
+SQLITE_TRIGGERS = [
+    # INSERT OR IGNORE + UPDATE instead of an upsert, which older SQLite versions don't allow in triggers
+    "CREATE TRIGGER IF NOT EXISTS reminder_status_count_ai AFTER INSERT ON reminder BEGIN "
+    "INSERT OR IGNORE INTO reminder_status_count(user_id, status, count) VALUES (new.user_id, new.status, 0); "
+    "UPDATE reminder_status_count SET count = count + 1 WHERE user_id = new.user_id AND status = new.status; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS reminder_status_count_ad AFTER DELETE ON reminder BEGIN "
+    "UPDATE reminder_status_count SET count = count - 1 WHERE user_id = old.user_id AND status = old.status; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS reminder_status_count_au AFTER UPDATE OF status, user_id ON reminder "
+    "WHEN old.status IS NOT new.status OR old.user_id IS NOT new.user_id BEGIN "
+    "UPDATE reminder_status_count SET count = count - 1 WHERE user_id = old.user_id AND status = old.status; "
+    "INSERT OR IGNORE INTO reminder_status_count(user_id, status, count) VALUES (new.user_id, new.status, 0); "
+    "UPDATE reminder_status_count SET count = count + 1 WHERE user_id = new.user_id AND status = new.status; "
+    "END",
+]
+
+POSTGRES_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION reminder_status_count_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            UPDATE reminder_status_count SET count = count - 1 WHERE user_id = OLD.user_id AND status = OLD.status;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO reminder_status_count(user_id, status, count) VALUES (NEW.user_id, NEW.status, 1)
+            ON CONFLICT (user_id, status) DO UPDATE SET count = reminder_status_count.count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS reminder_status_count_sync ON reminder",
+    "CREATE TRIGGER reminder_status_count_sync AFTER INSERT OR DELETE OR UPDATE OF status, user_id ON reminder "
+    "FOR EACH ROW EXECUTE FUNCTION reminder_status_count_sync()",
+]
+
+def setup_stats(engine: Engine):
+    """
+    Installs the triggers that keep reminder_status_count in step with every write to reminder,
+    raw UPDATEs from the dispatcher and recovery included, in the writer's own transaction.
+    """
+    triggers = {"sqlite": SQLITE_TRIGGERS, "postgresql": POSTGRES_TRIGGERS}.get(engine.dialect.name)
+    if triggers is None:
+        print(f"No status count triggers for {engine.dialect.name}, stats rely on the repair job")
+    else:
+        with engine.begin() as conn:
+            for statement in triggers:
+                conn.execute(text(statement))
+    # Counts rows written before the triggers existed
+    repair_status_counts()
+
+def _actual_counts(conn) -> dict:
+    return {
+        (user_id, status): count
+        for user_id, status, count in conn.execute(
+            select(Reminder.user_id, Reminder.status, func.count()).group_by(Reminder.user_id, Reminder.status)
+        ).all()
+    }
+
+def _stored_counts(conn) -> dict:
+    return {
+        (user_id, status): count
+        for user_id, status, count in conn.execute(
+            select(ReminderStatusCount.user_id, ReminderStatusCount.status, ReminderStatusCount.count)
+            .where(ReminderStatusCount.count != 0)
+        ).all()
+    }
+
+def repair_status_counts() -> int:
+    """
+    Job function called by APScheduler on an interval: recounts from the reminder table when the
+    counters drifted (e.g. writes from a backend without triggers). Returns the drifted entries.
+    """
+    with engine.connect() as conn:
+        actual = _actual_counts(conn)
+        stored = _stored_counts(conn)
+    drift = sum(1 for key in actual.keys() | stored.keys() if actual.get(key, 0) != stored.get(key, 0))
+    if not drift:
+        return 0
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Holds trigger updates back until the recount commits, so none is lost in between
+            conn.execute(text("LOCK TABLE reminder_status_count IN EXCLUSIVE MODE"))
+        # The DELETE takes the write lock first, so the recount below sees a stable reminder table
+        conn.execute(delete(ReminderStatusCount))
+        conn.execute(
+            insert(ReminderStatusCount).from_select(
+                ["user_id", "status", "count"],
+                select(Reminder.user_id, Reminder.status, func.count()).group_by(Reminder.user_id, Reminder.status),
+            )
+        )
+    print(f"[STATS] Repaired {drift} drifted status counts")
+    return drift
+
+async def reminder_stats(session: AsyncSession, user_id: int) -> dict:
+    """
+    Per-status counts from the counter table plus pending reminders due in the next 24 hours,
+    a range scan over ix_reminder_user_id_status_scheduled_time; neither grows with history.
+    """
+    rows = (await session.exec(
+        select(ReminderStatusCount.status, ReminderStatusCount.count)
+        .where(ReminderStatusCount.user_id == user_id, ReminderStatusCount.count > 0)
+    )).all()
+    now = utcnow()
+    upcoming = (await session.exec(
+        select(func.count()).select_from(Reminder).where(
+            Reminder.user_id == user_id,
+            Reminder.status == "pending",
+            Reminder.scheduled_time >= now,
+            Reminder.scheduled_time < now + timedelta(hours=UPCOMING_WINDOW_HOURS),
+        )
+    )).one()
+    by_status = {status: count for status, count in rows}
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "upcoming_24h": upcoming,
+    }
+
+async def pending_count(session: AsyncSession, user_id: int) -> int:
+    """
+    The user's pending reminders, read from the counter table for the quota check on create.
+    """
+    count = (await session.exec(
+        select(ReminderStatusCount.count)
+        .where(ReminderStatusCount.user_id == user_id, ReminderStatusCount.status == "pending")
+    )).first()
+    return count or 0
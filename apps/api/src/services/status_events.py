@@ -0,0 +1,117 @@
+import asyncio
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Optional
+from src.models import utcnow
+
+STATUS_STREAM_QUEUE_SIZE = int(os.getenv("STATUS_STREAM_QUEUE_SIZE", "100"))
+STATUS_STREAM_KEEPALIVE_SECONDS = int(os.getenv("STATUS_STREAM_KEEPALIVE_SECONDS", "15"))
+# Optional shared broker so status changes made in any worker reach streams held by any API process,
+# e.g. redis://localhost:6379/0. Needed whenever calls run in a separate `python -m src.worker`.
+STATUS_BROKER_URL = os.getenv("STATUS_BROKER_URL")
+
+class Subscription:
+    """
+    One open stream: an asyncio queue fed from any thread through its event loop.
+    """
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, queue_size: int = STATUS_STREAM_QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, event: dict):
+        def put():
+            # A client that stops reading loses deltas rather than holding up everyone else
+            if not self.queue.full():
+                self.queue.put_nowait(event)
+        try:
+            self.loop.call_soon_threadsafe(put)
+        except RuntimeError:
+            # The loop already closed (shutdown); the stream is gone anyway
+            pass
+
+class InMemoryStatusBroker:
+    """
+    Per-user fan-out within this process. Publishers are executor, scheduler and webhook
+    consumer threads; subscribers are SSE handlers on the event loop.
+    """
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscribers = self.subscriptions.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.subscriptions[subscription.user_id]
+
+    def publish(self, user_id: int, event: dict):
+        self.deliver(user_id, event)
+
+    def deliver(self, user_id: int, event: dict):
+        with self.lock:
+            subscribers = list(self.subscriptions.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+class RedisStatusBroker(InMemoryStatusBroker):
+    """
+    Publishes through Redis pub/sub; a listener thread per process fans messages out locally.
+    Requires the `redis` package.
+    """
+    def __init__(self, url: str):
+        import redis
+
+        super().__init__()
+        self.client = redis.Redis.from_url(url)
+        self.listener = None
+
+    def subscribe(self, user_id: int) -> Subscription:
+        if self.listener is None:
+            self.listener = threading.Thread(target=self._listen, name="status-broker", daemon=True)
+            self.listener.start()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id: int, event: dict):
+        self.client.publish(f"reminder-status:{user_id}", json.dumps(event))
+
+    def _listen(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe("reminder-status:*")
+        for message in pubsub.listen():
+            try:
+                user_id = int(message["channel"].decode().split(":", 1)[1])
+                self.deliver(user_id, json.loads(message["data"]))
+            except Exception as e:
+                print(f"[STREAM] Dropping malformed status message: {e}")
+
+def make_status_broker():
+    if STATUS_BROKER_URL:
+        return RedisStatusBroker(STATUS_BROKER_URL)
+    return InMemoryStatusBroker()
+
+status_broker = make_status_broker()
+
+def publish_status(user_id: int, reminder_id: int, status: str, vapi_call_id: Optional[str] = None):
+    """
+    Announces a committed status change; never lets a broker problem break the caller.
+    """
+    try:
+        status_broker.publish(user_id, {
+            "id": reminder_id,
+            "status": status,
+            "vapi_call_id": vapi_call_id,
+            "updated_at": utcnow().isoformat(),
+        })
+    except Exception as e:
+        print(f"[STREAM] Failed to publish status for reminder {reminder_id}: {e}")
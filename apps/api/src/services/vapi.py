@@ -1,37 +1,241 @@
+import asyncio
+import json
 import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Optional
+import httpx
 from vapi import Vapi
+from src.services.metrics import tracer, vapi_request_duration, vapi_errors, vapi_retries
+from src.services.call_templates import CompiledTemplate, compile_template
 
 VAPI_API_KEY = os.getenv("VAPI_API_KEY")
 VAPI_PHONE_NUMBER_ID = os.getenv("VAPI_PHONE_NUMBER_ID")
 VAPI_ASSISTANT_ID = os.getenv("VAPI_ASSISTANT_ID")
+VAPI_BASE_URL = os.getenv("VAPI_BASE_URL", "https://api.vapi.ai")
 
-client = Vapi(token=VAPI_API_KEY)
+# "http" uses the pooled async client below, "sdk" the blocking Vapi SDK
+VAPI_CLIENT = os.getenv("VAPI_CLIENT", "http")
+VAPI_TIMEOUT_SECONDS = float(os.getenv("VAPI_TIMEOUT_SECONDS", "10"))
+VAPI_MAX_CONNECTIONS = int(os.getenv("VAPI_MAX_CONNECTIONS", "20"))
+VAPI_MAX_RETRIES = int(os.getenv("VAPI_MAX_RETRIES", "3"))
+VAPI_BACKOFF_BASE_SECONDS = float(os.getenv("VAPI_BACKOFF_BASE_SECONDS", "0.5"))
+VAPI_BACKOFF_MAX_SECONDS = float(os.getenv("VAPI_BACKOFF_MAX_SECONDS", "30"))
+VAPI_BREAKER_THRESHOLD = int(os.getenv("VAPI_BREAKER_THRESHOLD", "5"))
+VAPI_BREAKER_RESET_SECONDS = float(os.getenv("VAPI_BREAKER_RESET_SECONDS", "30"))
 
-def make_reminder_call(phone_number: str, title: str, description: str):
+client = Vapi(token=VAPI_API_KEY, base_url=VAPI_BASE_URL)
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Transport failures raised before the request could reach Vapi, so retrying can't place a second call
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class VapiError(Exception):
+    pass
+
+class CircuitOpenError(VapiError):
+    pass
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and fails fast until `reset_seconds` have passed,
+    then lets a single trial call through (half-open) before closing again.
+    """
+    def __init__(self, threshold: int = VAPI_BREAKER_THRESHOLD, reset_seconds: float = VAPI_BREAKER_RESET_SECONDS):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        with self.lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_seconds
+
+    def before_call(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_seconds or self.trial_in_flight:
+                vapi_errors.labels("circuit_open").inc()
+                raise CircuitOpenError("Vapi circuit breaker is open")
+            self.trial_in_flight = True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"[VAPI] Circuit breaker opened after {self.failures} consecutive failures")
+                self.opened_at = time.monotonic()
+
+circuit_breaker = CircuitBreaker()
+
+def build_assistant_overrides(title: str, description: str, template: Optional[CompiledTemplate] = None) -> dict:
+    # Wire (camelCase) keys, which the SDK also accepts as-is
+    return (template or compile_template()).render(title, description)
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _backoff_seconds(attempt: int) -> float:
+    # Full jitter keeps retries from a burst of failed calls from lining up again
+    return random.uniform(0, min(VAPI_BACKOFF_MAX_SECONDS, VAPI_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+class AsyncVapiClient:
+    """
+    Minimal async client for the Vapi REST API sharing one pooled keep-alive connection set.
+    """
+    def __init__(self, api_key: Optional[str] = VAPI_API_KEY, base_url: str = VAPI_BASE_URL, breaker: CircuitBreaker = circuit_breaker):
+        self.breaker = breaker
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=VAPI_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=VAPI_MAX_CONNECTIONS, max_keepalive_connections=VAPI_MAX_CONNECTIONS),
+        )
+
+    async def create_call(self, payload: dict) -> dict:
+        """
+        POST /call. The call isn't idempotent, so only failures where the request provably never
+        reached Vapi are retried (jittered exponential backoff): connect errors and timeouts, pool
+        timeouts, and 429/503 with Retry-After. Read/write timeouts and other 5xx may already have
+        created the call and fail the attempt instead of risking a second ring.
+        """
+        self.breaker.before_call()
+        # Serialized once for all retries, without the default separators' padding
+        body = json.dumps(payload, separators=(",", ":"))
+        for attempt in range(VAPI_MAX_RETRIES + 1):
+            delay = None
+            started = time.perf_counter()
+            try:
+                response = await self.http.post("/call", content=body, headers=JSON_HEADERS)
+            except httpx.TransportError as e:
+                kind = "timeout" if isinstance(e, httpx.TimeoutException) else "transport"
+                vapi_request_duration.labels(kind).observe(time.perf_counter() - started)
+                vapi_errors.labels(kind).inc()
+                error = VapiError(f"Vapi request failed: {e!r}")
+                if not isinstance(e, NOT_SENT_ERRORS):
+                    break
+            else:
+                outcome = "429" if response.status_code == 429 else f"{response.status_code // 100}xx"
+                vapi_request_duration.labels(outcome).observe(time.perf_counter() - started)
+                if response.status_code < 400:
+                    self.breaker.record_success()
+                    return response.json()
+                vapi_errors.labels(outcome).inc()
+                error = VapiError(f"Vapi returned {response.status_code}: {response.text}")
+                if response.status_code != 429 and response.status_code < 500:
+                    # The request itself is wrong, retrying won't help and Vapi is healthy
+                    self.breaker.record_success()
+                    raise error
+                delay = _retry_after_seconds(response)
+                # Only an explicit "come back later" proves the call wasn't created
+                if response.status_code not in (429, 503) or delay is None:
+                    break
+
+            if attempt == VAPI_MAX_RETRIES:
+                break
+            delay = _backoff_seconds(attempt) if delay is None else min(delay, VAPI_BACKOFF_MAX_SECONDS)
+            print(f"[VAPI] {error}; retrying in {delay:.2f}s (attempt {attempt + 1}/{VAPI_MAX_RETRIES})")
+            vapi_retries.inc()
+            await asyncio.sleep(delay)
+
+        self.breaker.record_failure()
+        raise error
+
+    async def aclose(self):
+        await self.http.aclose()
+
+_async_client: Optional[AsyncVapiClient] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _vapi_loop() -> asyncio.AbstractEventLoop:
     """
-    Triggers an outbound call using Vapi with a system prompt override.
+    Event loop on a daemon thread that owns the pooled client, so blocking callers can share it.
     """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="vapi-client", daemon=True).start()
+        return _loop
+
+async def make_reminder_call_async(phone_number: str, title: str, description: str, template: Optional[CompiledTemplate] = None):
+    """
+    Async variant of make_reminder_call using the pooled HTTP client.
+    """
+    global _async_client
     if not VAPI_API_KEY or not VAPI_PHONE_NUMBER_ID or not VAPI_ASSISTANT_ID:
         print("Error: VAPI_API_KEY, VAPI_PHONE_NUMBER_ID, or VAPI_ASSISTANT_ID not set in environment.")
         return None
 
-    server_url = os.getenv("API_PUBLIC_URL")
-    assistant_overrides = {
-        "first_message": f"Hello, this is the Flow Reminder assistant calling you about a reminder for: {title}. Here are the details: {description}",
-    }
-
-    if server_url:
-        assistant_overrides["server"] = {"url": f"{server_url}/webhook/vapi"}
-
-    # Using a transient assistant for the call
-    call = client.calls.create(
-        phone_number_id=VAPI_PHONE_NUMBER_ID,
-        customer={
-            "number": phone_number,
-        },
-        assistant_id=VAPI_ASSISTANT_ID,
-        assistant_overrides=assistant_overrides
-    )
-
-    print(f"Call initiated: {getattr(call, 'id', 'unknown')}")
-    return call
+    if _async_client is None:
+        _async_client = AsyncVapiClient()
+
+    data = await _async_client.create_call({
+        "phoneNumberId": VAPI_PHONE_NUMBER_ID,
+        "customer": {"number": phone_number},
+        "assistantId": VAPI_ASSISTANT_ID,
+        "assistantOverrides": build_assistant_overrides(title, description, template),
+    })
+
+    print(f"Call initiated: {data.get('id', 'unknown')}")
+    return SimpleNamespace(id=data.get("id"), status=data.get("status"))
+
+def make_reminder_call(phone_number: str, title: str, description: str, template: Optional[CompiledTemplate] = None):
+    """
+    Triggers an outbound call using Vapi, with the script rendered from `template` (the built-in one by default).
+    """
+    if not VAPI_API_KEY or not VAPI_PHONE_NUMBER_ID or not VAPI_ASSISTANT_ID:
+        print("Error: VAPI_API_KEY, VAPI_PHONE_NUMBER_ID, or VAPI_ASSISTANT_ID not set in environment.")
+        return None
+
+    with tracer.start_as_current_span("vapi.create_call") as span:
+        span.set_attribute("vapi.client", VAPI_CLIENT)
+        if VAPI_CLIENT == "http":
+            future = asyncio.run_coroutine_threadsafe(
+                make_reminder_call_async(phone_number, title, description, template), _vapi_loop()
+            )
+            return future.result()
+
+        circuit_breaker.before_call()
+        try:
+            # Using a transient assistant for the call
+            call = client.calls.create(
+                phone_number_id=VAPI_PHONE_NUMBER_ID,
+                customer={
+                    "number": phone_number,
+                },
+                assistant_id=VAPI_ASSISTANT_ID,
+                assistant_overrides=build_assistant_overrides(title, description, template)
+            )
+        except Exception:
+            circuit_breaker.record_failure()
+            raise
+        circuit_breaker.record_success()
+
+        print(f"Call initiated: {getattr(call, 'id', 'unknown')}")
+        return call
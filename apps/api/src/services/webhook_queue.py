@@ -0,0 +1,90 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List
+
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "10000"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "200"))
+WEBHOOK_FLUSH_SECONDS = float(os.getenv("WEBHOOK_FLUSH_SECONDS", "0.2"))
+WEBHOOK_DEDUP_WINDOW = int(os.getenv("WEBHOOK_DEDUP_WINDOW", "100000"))
+
+class WebhookIngestor:
+    """
+    Decouples webhook acknowledgement from processing: `enqueue` only drops the event on a
+    bounded queue, and a consumer thread hands de-duplicated batches to `handler`, which is
+    expected to apply them in a single commit.
+    """
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], None],
+        queue_size: int = WEBHOOK_QUEUE_SIZE,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+        flush_seconds: float = WEBHOOK_FLUSH_SECONDS,
+        dedup_window: int = WEBHOOK_DEDUP_WINDOW,
+    ):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dedup_window = dedup_window
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.seen: OrderedDict = OrderedDict()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._consume, name="webhook-ingestor", daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        # Drains whatever is still queued before stopping
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def enqueue(self, event_id: str, event: Any) -> bool:
+        """
+        Returns False when the queue is full, so the caller can ask the sender to retry.
+        """
+        try:
+            self.queue.put_nowait((event_id, event))
+            return True
+        except queue.Full:
+            return False
+
+    def _is_duplicate(self, event_id: str) -> bool:
+        return event_id in self.seen
+
+    def _mark_seen(self, event_ids: List[str]):
+        # Only after the handler applied them, so a sender's retry of a failed batch still gets through
+        for event_id in event_ids:
+            self.seen[event_id] = None
+        while len(self.seen) > self.dedup_window:
+            self.seen.popitem(last=False)
+
+    def _consume(self):
+        while True:
+            item = self.queue.get()
+            batch = []
+            batch_ids = set()
+            # Keep collecting until the batch is full or the queue stays quiet for flush_seconds
+            while item is not None:
+                event_id, event = item
+                if not self._is_duplicate(event_id) and event_id not in batch_ids:
+                    batch_ids.add(event_id)
+                    batch.append(event)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get(timeout=self.flush_seconds)
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.handler(batch)
+                except Exception as e:
+                    print(f"[WEBHOOK] Failed to apply {len(batch)} events, a retry will be accepted: {e}")
+                else:
+                    self._mark_seen(batch_ids)
+            if item is None:
+                break
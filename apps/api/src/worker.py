@@ -0,0 +1,43 @@
+"""
+Standalone scheduler/call worker: `python -m src.worker` (from apps/api).
+
+Runs the dispatch loop (or per-reminder APScheduler jobs) and places calls, without serving HTTP.
+Pair it with API processes started with API_RUNS_SCHEDULER=false, which then only write
+pending reminders and jobs. Any number of workers can run side by side.
+"""
+import os
+import signal
+import threading
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+load_dotenv()
+from prometheus_client import start_http_server
+from src.database import create_db_and_tables, engine, scheduler_engine
+from src.services.coordination import WORKER_ID
+from src.services.metrics import instrument_engine
+from src.services.scheduling import start_scheduling, stop_scheduling
+
+# Serves /metrics for this process when set (the API's /metrics only covers the API process)
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+
+def main():
+    stopped = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stopped.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopped.set())
+
+    instrument_engine(engine, "app")
+    instrument_engine(scheduler_engine, "scheduler")
+    if WORKER_METRICS_PORT:
+        start_http_server(WORKER_METRICS_PORT)
+        print(f"[WORKER] Metrics on port {WORKER_METRICS_PORT}")
+
+    create_db_and_tables()
+    start_scheduling(run_calls=True)
+    print(f"[WORKER] {WORKER_ID} running")
+    stopped.wait()
+    print(f"[WORKER] {WORKER_ID} shutting down")
+    stop_scheduling()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Local stand-in for the Vapi REST API, for exercising the call path without placing real calls.
+
+    uvicorn stub_vapi:app --port 8010
+    VAPI_BASE_URL=http://localhost:8010 uvicorn main:app --port 8000
+
+Failure injection (env): STUB_VAPI_FAILURE_RATE (0-1) answers with STUB_VAPI_FAILURE_STATUS
+(default 503; 429 and 503 also send Retry-After, the only failures the client retries), STUB_VAPI_LATENCY_MS delays every response.
+"""
+import asyncio
+import os
+import random
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+STUB_VAPI_FAILURE_RATE = float(os.getenv("STUB_VAPI_FAILURE_RATE", "0"))
+STUB_VAPI_FAILURE_STATUS = int(os.getenv("STUB_VAPI_FAILURE_STATUS", "503"))
+STUB_VAPI_LATENCY_MS = int(os.getenv("STUB_VAPI_LATENCY_MS", "0"))
+
+app = FastAPI()
+calls = []
+# Every POST /call body, including the ones answered with an injected failure or timed out by the client
+received = []
+
+@app.post("/call")
+async def create_call(request: Request):
+    payload = await request.json()
+    received.append(payload)
+    if STUB_VAPI_LATENCY_MS:
+        await asyncio.sleep(STUB_VAPI_LATENCY_MS / 1000)
+
+    if random.random() < STUB_VAPI_FAILURE_RATE:
+        headers = {"Retry-After": "1"} if STUB_VAPI_FAILURE_STATUS in (429, 503) else {}
+        return JSONResponse({"message": "stub failure"}, status_code=STUB_VAPI_FAILURE_STATUS, headers=headers)
+
+    call = {"id": str(uuid.uuid4()), "status": "queued", **payload}
+    calls.append(call)
+    return JSONResponse(call, status_code=201)
+
+@app.get("/call")
+async def list_calls():
+    return calls
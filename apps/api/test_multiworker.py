@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import multiprocessing
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+# Add the apps/api directory to sys.path to import src
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+WORKERS = int(os.getenv("TEST_WORKERS", "4"))
+REMINDERS = int(os.getenv("TEST_REMINDERS", "200"))
+
+def configure(tmp_dir: str):
+    # Must run before src is imported so every process shares the same database
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'database.db')}"
+    os.environ["SCHEDULER_DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'scheduler_jobs.db')}"
+    os.environ["SCHEDULER_MODE"] = "dispatcher"
+    os.environ["DISPATCH_BATCH_SIZE"] = "20"
+    os.environ["CALL_RATE_PER_SECOND"] = "10000"
+
+def worker(tmp_dir: str, calls_path: str, index: int):
+    configure(tmp_dir)
+    from types import SimpleNamespace
+    from src.services import scheduling
+    from src.services.dispatcher import dispatch_due_reminders
+
+    def stub_call(phone_number: str, title: str, description: str, template=None):
+        with open(calls_path, "a") as f:
+            f.write(f"{title}\n")
+        return SimpleNamespace(id=f"call-{title}-{index}")
+
+    scheduling.make_reminder_call = stub_call
+    scheduling.call_executor.start()
+    # Half the workers also replay every reminder as if a leftover per-reminder job fired there
+    if index % 2:
+        for reminder_id in range(1, REMINDERS + 1):
+            scheduling.execute_reminder_call(reminder_id)
+    dispatch_due_reminders(scheduling.submit_reminder_call)
+    scheduling.call_executor.shutdown()
+
+def stale_queue_worker(tmp_dir: str):
+    configure(tmp_dir)
+    from types import SimpleNamespace
+    from sqlalchemy import update
+    from src.database import create_db_and_tables, SessionLocal, engine
+    from src.models import User, Reminder
+    from src.services import scheduling
+    from src.services.coordination import claim_reminder_for_dispatch
+
+    calls = []
+    scheduling.make_reminder_call = lambda phone_number, title, description, template=None: (
+        calls.append(title) or SimpleNamespace(id=f"call-{title}")
+    )
+    create_db_and_tables()
+    due = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+    with SessionLocal() as session:
+        user = User(phone_number="+14155552671")
+        session.add(user)
+        session.commit()
+        session.add_all([
+            Reminder(title=title, description="", scheduled_time=due, phone_to_call=user.phone_number, user_id=user.id)
+            for title in ("rescheduled", "released", "claimed")
+        ])
+        session.commit()
+    for reminder_id in (1, 2, 3):
+        assert claim_reminder_for_dispatch(reminder_id)
+    with engine.begin() as conn:
+        # PUT /reminders/1 moved it to tomorrow while its call sat in the queue
+        conn.execute(
+            update(Reminder).where(Reminder.id == 1)
+            .values(status="pending", scheduled_time=due + timedelta(days=1), claimed_by=None, claimed_at=None)
+        )
+        # The claim on 2 went stale and another worker took it
+        conn.execute(update(Reminder).where(Reminder.id == 2).values(claimed_by="other-worker"))
+    for reminder_id in (1, 2, 3):
+        scheduling.place_reminder_call(reminder_id)
+
+    with SessionLocal() as session:
+        statuses = {reminder.title: reminder.status for reminder in session.query(Reminder).all()}
+    assert calls == ["claimed"], calls
+    assert statuses == {"rescheduled": "pending", "released": "dispatching", "claimed": "calling"}, statuses
+
+def test_stale_queue_item_does_not_call():
+    # In its own process: src binds the database URL at import time
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        process = multiprocessing.get_context("spawn").Process(target=stale_queue_worker, args=(tmp_dir,))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+
+def test_each_reminder_called_once():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configure(tmp_dir)
+        from src.database import create_db_and_tables, SessionLocal
+        from src.models import User, Reminder
+
+        create_db_and_tables()
+        due = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1)
+        with SessionLocal() as session:
+            user = User(phone_number="+14155552671")
+            session.add(user)
+            session.commit()
+            session.add_all([
+                Reminder(title=str(i), description="", scheduled_time=due, phone_to_call=user.phone_number, user_id=user.id)
+                for i in range(REMINDERS)
+            ])
+            session.commit()
+
+        calls_path = os.path.join(tmp_dir, "calls.txt")
+        open(calls_path, "w").close()
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=worker, args=(tmp_dir, calls_path, i)) for i in range(WORKERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        with open(calls_path) as f:
+            calls = Counter(line.strip() for line in f if line.strip())
+        duplicates = {title: count for title, count in calls.items() if count > 1}
+        print(f"{WORKERS} workers placed {sum(calls.values())} calls for {REMINDERS} reminders, duplicates: {duplicates}")
+        assert len(calls) == REMINDERS
+        assert not duplicates
+
+if __name__ == "__main__":
+    test_each_reminder_called_once()
+    test_stale_queue_item_does_not_call()
@@ -0,0 +1,102 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Add the apps/api directory to sys.path to import src
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+from src.models import Reminder
+from src.services import recurrence
+from src.services.recurrence import advance_recurrence, first_occurrence, validate_recurrence
+
+class RecordingSession:
+    """
+    Stands in for a Session: advance_recurrence only adds the reminder and its event.
+    """
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+def series(rule: str, start: datetime, scheduled_time: datetime, occurrence: int, tz_name=None, status="completed") -> Reminder:
+    return Reminder(
+        id=1, user_id=1, title="t", phone_to_call="+14155552671", status=status, recurrence=rule,
+        timezone=tz_name, recurrence_start=start, scheduled_time=scheduled_time, occurrence=occurrence,
+    )
+
+def at(monkeypatch, now: datetime):
+    monkeypatch.setattr(recurrence, "utcnow", lambda: now)
+
+def test_first_occurrence_is_first_match_at_or_after_start():
+    # Wednesday 09:00 UTC, weekly on Mondays
+    assert first_occurrence("FREQ=WEEKLY;BYDAY=MO", datetime(2030, 1, 2, 9)) == datetime(2030, 1, 7, 9)
+    assert first_occurrence("FREQ=DAILY", datetime(2030, 1, 2, 9)) == datetime(2030, 1, 2, 9)
+
+def test_first_occurrence_uses_wall_clock_time_in_timezone():
+    # 18:00 in New York (EST) is 23:00 UTC; BYHOUR is read in the series' zone
+    assert first_occurrence("FREQ=DAILY;BYHOUR=8;BYMINUTE=0", datetime(2030, 1, 2, 23), "America/New_York") == datetime(2030, 1, 3, 13)
+
+def test_advance_keeps_wall_clock_time_across_dst(monkeypatch):
+    # 09:00 in Berlin is 08:00 UTC before the switch on 2030-03-31 and 07:00 UTC after it
+    start = datetime(2030, 3, 30, 8)
+    reminder = series("FREQ=DAILY", start, start, 1, "Europe/Berlin")
+    at(monkeypatch, start)
+    assert advance_recurrence(RecordingSession(), reminder)
+    assert reminder.scheduled_time == datetime(2030, 3, 31, 7)
+    assert reminder.occurrence == 2
+
+def test_advance_skips_passed_occurrences_and_counts_them(monkeypatch):
+    start = datetime(2030, 1, 1, 9)
+    reminder = series("FREQ=DAILY", start, start, 1, status="missed")
+    reminder.vapi_call_id = "call-1"
+    reminder.claimed_by = "worker"
+    session = RecordingSession()
+    # Down from Jan 1 until after the Jan 4 call time: Jan 2-4 passed uncalled
+    at(monkeypatch, datetime(2030, 1, 4, 10))
+    assert advance_recurrence(session, reminder)
+    assert reminder.scheduled_time == datetime(2030, 1, 5, 9)
+    assert reminder.occurrence == 5
+    assert (reminder.status, reminder.vapi_call_id, reminder.claimed_by) == ("pending", None, None)
+    assert [event.type for event in session.added if event is not reminder] == ["occurrence_scheduled"]
+
+def test_advance_ignores_non_final_status(monkeypatch):
+    start = datetime(2030, 1, 1, 9)
+    reminder = series("FREQ=DAILY", start, start, 1, status="calling")
+    at(monkeypatch, start)
+    assert not advance_recurrence(RecordingSession(), reminder)
+    assert reminder.scheduled_time == start
+
+@pytest.mark.parametrize("rule", ["FREQ=DAILY;COUNT=3", "FREQ=DAILY;UNTIL=20300103T090000Z"])
+def test_advance_ends_exhausted_series(monkeypatch, rule):
+    start = datetime(2030, 1, 1, 9)
+    last = datetime(2030, 1, 3, 9)
+    reminder = series(rule, start, last, 3)
+    at(monkeypatch, last)
+    assert not advance_recurrence(RecordingSession(), reminder)
+    assert (reminder.status, reminder.scheduled_time, reminder.occurrence) == ("completed", last, 3)
+
+@pytest.mark.parametrize("rule", [
+    "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10",
+    "RRULE:FREQ=DAILY;BYHOUR=9;BYMINUTE=30",
+    "FREQ=MONTHLY;BYMONTHDAY=1",
+])
+def test_accepts_at_most_one_call_per_day(rule):
+    assert validate_recurrence(rule) == rule
+
+@pytest.mark.parametrize("rule", [
+    "FREQ=HOURLY",
+    "FREQ=MINUTELY;INTERVAL=30",
+    "FREQ=DAILY;BYHOUR=9,17",
+    "FREQ=WEEKLY;BYDAY=MO;BYMINUTE=0,15,30,45",
+    "FREQ=DAILY;BYSECOND=0,30",
+    "FREQ=DAILY\nRRULE:FREQ=DAILY;BYHOUR=18",
+])
+def test_rejects_more_than_one_call_per_day(rule):
+    with pytest.raises(ValueError):
+        validate_recurrence(rule)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
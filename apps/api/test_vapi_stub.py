@@ -0,0 +1,98 @@
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+import uvicorn
+
+# Add the apps/api directory to sys.path to import src
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+import stub_vapi
+from src.services import vapi
+from src.services.vapi import AsyncVapiClient, CircuitBreaker, CircuitOpenError, VapiError, VAPI_BREAKER_THRESHOLD
+
+PAYLOAD = {"phoneNumberId": "pn", "customer": {"number": "+14155552671"}, "assistantId": "as"}
+
+@pytest.fixture(scope="module")
+def stub_url():
+    """
+    Runs stub_vapi on a free local port for the module's tests.
+    """
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(stub_vapi.app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server.should_exit = True
+    thread.join()
+
+@pytest.fixture
+def stub(monkeypatch):
+    """
+    Failure injection for one test, with retries that don't wait out the stub's Retry-After.
+    """
+    stub_vapi.received.clear()
+    monkeypatch.setattr(vapi, "VAPI_BACKOFF_MAX_SECONDS", 0.01)
+
+    def inject(status: int = 503, rate: float = 1.0, latency_ms: int = 0):
+        monkeypatch.setattr(stub_vapi, "STUB_VAPI_FAILURE_STATUS", status)
+        monkeypatch.setattr(stub_vapi, "STUB_VAPI_FAILURE_RATE", rate)
+        monkeypatch.setattr(stub_vapi, "STUB_VAPI_LATENCY_MS", latency_ms)
+    return inject
+
+def create_call(base_url: str, breaker: CircuitBreaker) -> dict:
+    async def run():
+        client = AsyncVapiClient(api_key="test", base_url=base_url, breaker=breaker)
+        try:
+            return await client.create_call(PAYLOAD)
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+def test_call_created(stub_url, stub):
+    stub(rate=0)
+    call = create_call(stub_url, CircuitBreaker())
+    assert call["id"] and call["customer"] == PAYLOAD["customer"]
+    assert len(stub_vapi.received) == 1
+
+def test_503_with_retry_after_is_retried(stub_url, stub):
+    stub(status=503)
+    with pytest.raises(VapiError, match="503"):
+        create_call(stub_url, CircuitBreaker())
+    assert len(stub_vapi.received) == vapi.VAPI_MAX_RETRIES + 1
+
+def test_502_is_not_retried(stub_url, stub):
+    # May have created the call: retrying could ring the phone twice
+    stub(status=502)
+    with pytest.raises(VapiError, match="502"):
+        create_call(stub_url, CircuitBreaker())
+    assert len(stub_vapi.received) == 1
+
+def test_read_timeout_is_not_retried(stub_url, stub, monkeypatch):
+    stub(rate=0, latency_ms=500)
+    monkeypatch.setattr(vapi, "VAPI_TIMEOUT_SECONDS", 0.1)
+    with pytest.raises(VapiError, match="ReadTimeout"):
+        create_call(stub_url, CircuitBreaker())
+    assert len(stub_vapi.received) == 1
+
+def test_breaker_opens_after_threshold_failures(stub_url, stub):
+    stub(status=502)
+    breaker = CircuitBreaker()
+    for _ in range(VAPI_BREAKER_THRESHOLD):
+        with pytest.raises(VapiError):
+            create_call(stub_url, breaker)
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError):
+        create_call(stub_url, breaker)
+    # Failed fast without reaching Vapi
+    assert len(stub_vapi.received) == VAPI_BREAKER_THRESHOLD
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,35 @@
+import os
+import sys
+
+# Add the apps/api directory to sys.path to import src
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+from src.services.webhook_queue import WebhookIngestor
+
+def test_retry_after_failed_batch_is_applied():
+    applied = []
+    failures = [RuntimeError("database is locked")]
+
+    def handler(batch):
+        if failures:
+            raise failures.pop()
+        applied.extend(batch)
+
+    ingestor = WebhookIngestor(handler, flush_seconds=0.01)
+    ingestor.start()
+    ingestor.enqueue("call-1:end-of-call-report", "first")
+    ingestor.shutdown()
+    assert applied == []
+
+    # Vapi retries the same event: it must reach the handler, and later duplicates must not
+    ingestor.start()
+    ingestor.enqueue("call-1:end-of-call-report", "retry")
+    ingestor.enqueue("call-1:end-of-call-report", "duplicate")
+    ingestor.shutdown()
+    ingestor.start()
+    ingestor.enqueue("call-1:end-of-call-report", "late duplicate")
+    ingestor.shutdown()
+    assert applied == ["retry"]
+
+if __name__ == "__main__":
+    test_retry_after_failed_batch_is_applied()
@@ -3,11 +3,13 @@ import { useState } from "react";
 import { Skeleton } from "@/components/ui/skeleton";
 import { ReminderDrawer } from "@/components/reminder-drawer";
 import { useListReminders, type Reminder } from "@/hooks/use-reminders";
+import { useReminderStream } from "@/hooks/use-reminder-stream";
 import { RemindersTimeline } from "@/components/reminders-timeline";
 import { ReminderCard } from "@/components/reminder-card";
 
 export default function Home() {
   const { data, isLoading, error } = useListReminders({ limit: 100 });
+  useReminderStream();
   const reminders = data?.items;
   const now = new Date();
 
@@ -17,7 +17,7 @@ export const getColumns = (onEdit: (reminder: Reminder) => void): ColumnDef<Remi
     cell: ({ row }) => {
       const status = row.getValue("status") as string
       return (
-        <Badge variant={status === "completed" ? "default" : status === "failed" ? "destructive" : "secondary"} className="capitalize">
+        <Badge variant={status === "completed" ? "default" : status === "failed" || status === "missed" ? "destructive" : "secondary"} className="capitalize">
           {status}
         </Badge>
       )
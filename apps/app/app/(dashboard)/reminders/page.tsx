@@ -2,6 +2,7 @@
 
 import { useState, useEffect, useMemo, useCallback } from "react"
 import { useListReminders, Reminder } from "@/hooks/use-reminders"
+import { useReminderStream } from "@/hooks/use-reminder-stream"
 import { getColumns } from "./columns"
 import { DataTable } from "./data-table"
 import { ReminderDrawer } from "@/components/reminder-drawer"
@@ -38,6 +39,7 @@ export default function RemindersPage() {
   const columns = useMemo(() => getColumns(handleEditReminder), [handleEditReminder])
 
   const { data, isLoading } = useListReminders({ page, limit, search: debouncedSearch, status })
+  useReminderStream()
   
   const isEmptyState = !isLoading && data?.items?.length === 0 && search === "" && status === "all"
   
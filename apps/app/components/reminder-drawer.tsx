@@ -154,6 +154,7 @@ export function ReminderDrawer({ open: controlledOpen, onOpenChange: setControll
               description: value.description,
               scheduled_time: scheduled_time_iso,
               phone_to_call: phone_to_call,
+              timezone: value.timezone,
             }
           })
         } else {
@@ -162,6 +163,7 @@ export function ReminderDrawer({ open: controlledOpen, onOpenChange: setControll
             description: value.description,
             scheduled_time: scheduled_time_iso,
             phone_to_call: phone_to_call,
+            timezone: value.timezone,
           })
         }
         setOpen(false)
@@ -10,6 +10,7 @@ import {
   type LucideIcon
 } from "lucide-react"
 import { useUser } from "@/hooks/use-user"
+import { api } from "@/lib/api"
 import { countryCodeEmoji } from "country-code-emoji"
 import { parsePhoneNumber, type CountryCode } from "libphonenumber-js"
 import {
@@ -43,7 +44,12 @@ export function Sidebar({ className, ...props }: SidebarProps) {
   const router = useRouter()
   const pathname = usePathname()
 
-  const handleLogout = () => {
+  const handleLogout = async () => {
+    try {
+      await api.post("/signout")
+    } catch (error) {
+      console.error("Error signing out:", error)
+    }
     Cookies.remove("session_token")
     router.push("/signin")
   }
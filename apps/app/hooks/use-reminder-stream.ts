@@ -0,0 +1,43 @@
+import { useEffect } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { api } from "@/lib/api";
+import type { ReminderListResponse } from "@/hooks/use-reminders";
+
+export interface ReminderStatusEvent {
+  id: number;
+  status: string;
+  vapi_call_id?: string | null;
+  updated_at: string;
+}
+
+// Patches cached reminder lists from the server's status stream instead of re-polling them
+export function useReminderStream() {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    const source = new EventSource(`${api.defaults.baseURL}/reminders/stream`, { withCredentials: true });
+
+    source.addEventListener("status", (message) => {
+      const event: ReminderStatusEvent = JSON.parse((message as MessageEvent).data);
+      queryClient.setQueriesData<ReminderListResponse>({ queryKey: ["reminders"] }, (data) =>
+        data && {
+          ...data,
+          items: data.items.map((reminder) =>
+            reminder.id === event.id ? { ...reminder, status: event.status } : reminder
+          ),
+        }
+      );
+    });
+
+    // Changes made while disconnected were missed, so refetch once after reconnecting
+    let connectedBefore = false;
+    source.onopen = () => {
+      if (connectedBefore) {
+        queryClient.invalidateQueries({ queryKey: ["reminders"] });
+      }
+      connectedBefore = true;
+    };
+
+    return () => source.close();
+  }, [queryClient]);
+}
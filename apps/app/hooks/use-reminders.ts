@@ -9,6 +9,11 @@ export interface Reminder {
   scheduled_time?: string;
   phone_to_call: string;
   user_id: number;
+  status?: string;
+  recurrence?: string | null;
+  timezone?: string | null;
+  template_id?: number | null;
+  occurrence?: number | null;
 }
 
 export interface CreateReminderPayload {
@@ -16,6 +21,9 @@ export interface CreateReminderPayload {
   description?: string;
   scheduled_time?: string;
   phone_to_call: string;
+  recurrence?: string | null;
+  timezone?: string | null;
+  template_id?: number | null;
 }
 
 export function useCreateReminder() {